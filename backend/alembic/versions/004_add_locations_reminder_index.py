@@ -0,0 +1,41 @@
+"""Add composite index for daily reminder generation.
+
+Revision ID: 004_locations_reminder_index
+Revises: 003_product_orders
+Create Date: 2026-10-16
+
+Agrega índice compuesto sobre locations para el filtro de
+generate_daily_reminders (active, product_id, last_compliance_at).
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '004_locations_reminder_index'
+down_revision = '003_product_orders'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    """Verifica si un índice ya existe en la tabla."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [ix['name'] for ix in inspector.get_indexes(table_name)]
+
+
+def upgrade() -> None:
+    """Crear índice de recordatorios en locations."""
+    if not index_exists('locations', 'ix_locations_reminder_due'):
+        op.create_index(
+            'ix_locations_reminder_due',
+            'locations',
+            ['active', 'product_id', 'last_compliance_at']
+        )
+
+
+def downgrade() -> None:
+    """Eliminar índice de recordatorios en locations."""
+    if index_exists('locations', 'ix_locations_reminder_due'):
+        op.drop_index('ix_locations_reminder_due', table_name='locations')
@@ -0,0 +1,33 @@
+"""Add SENDING value to reminder status enum.
+
+Revision ID: 005_reminder_sending_status
+Revises: 004_locations_reminder_index
+Create Date: 2026-10-16
+
+Agrega el estado SENDING a reminderstatus. El scheduler lo usa para
+reclamar recordatorios antes de enviarlos (FOR UPDATE SKIP LOCKED).
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '005_reminder_sending_status'
+down_revision = '004_locations_reminder_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Agregar SENDING al enum reminderstatus."""
+    # ALTER TYPE ... ADD VALUE no puede usarse dentro de la misma transacción
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE reminderstatus ADD VALUE IF NOT EXISTS 'SENDING'")
+
+
+def downgrade() -> None:
+    """Devolver a PENDING los recordatorios en SENDING.
+
+    PostgreSQL no permite eliminar valores de un enum, así que el valor
+    queda definido pero sin uso.
+    """
+    op.execute("UPDATE scheduled_reminders SET status = 'PENDING' WHERE status = 'SENDING'")
@@ -0,0 +1,64 @@
+"""Add partial indexes for pending and sent reminders.
+
+Revision ID: 006_reminder_partial_indexes
+Revises: 005_reminder_sending_status
+Create Date: 2026-10-16
+
+Agrega índices parciales sobre scheduled_reminders para las consultas
+que el scheduler corre cada minuto:
+- send_pending_reminders: status = PENDING y scheduled_for <= ahora
+- check_escalations: status = SENT y sent_at <= umbral
+
+Se crean con CONCURRENTLY para no bloquear escrituras sobre la tabla.
+"""
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+# revision identifiers, used by Alembic.
+revision = '006_reminder_partial_indexes'
+down_revision = '005_reminder_sending_status'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    """Verifica si un índice ya existe en la tabla."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [ix['name'] for ix in inspector.get_indexes(table_name)]
+
+
+def upgrade() -> None:
+    """Crear índices parciales de recordatorios."""
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        if not index_exists('scheduled_reminders', 'ix_scheduled_reminders_pending_due'):
+            op.create_index(
+                'ix_scheduled_reminders_pending_due',
+                'scheduled_reminders',
+                ['scheduled_for'],
+                postgresql_where=text("status = 'PENDING'"),
+                postgresql_concurrently=True
+            )
+
+        if not index_exists('scheduled_reminders', 'ix_scheduled_reminders_sent_due'):
+            op.create_index(
+                'ix_scheduled_reminders_sent_due',
+                'scheduled_reminders',
+                ['sent_at'],
+                postgresql_where=text("status = 'SENT'"),
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Eliminar índices parciales de recordatorios."""
+    with op.get_context().autocommit_block():
+        for index_name in ('ix_scheduled_reminders_sent_due', 'ix_scheduled_reminders_pending_due'):
+            if index_exists('scheduled_reminders', index_name):
+                op.drop_index(
+                    index_name,
+                    table_name='scheduled_reminders',
+                    postgresql_concurrently=True
+                )
@@ -0,0 +1,64 @@
+"""Drop AI validation columns duplicated in the ai_validation JSONB.
+
+Revision ID: 007_drop_ai_validation_columns
+Revises: 006_reminder_partial_indexes
+Create Date: 2026-10-16
+
+ai_product_detected, ai_drainage_visible, ai_appears_recent,
+ai_appears_screenshot, ai_issues y ai_summary duplicaban datos que ya se
+guardan completos en ai_validation. El modelo ahora los expone como
+hybrid properties sobre el JSONB.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = '007_drop_ai_validation_columns'
+down_revision = '006_reminder_partial_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (columna, clave en ai_validation, tipo)
+AI_COLUMNS = [
+    ('ai_product_detected', 'product_detected', sa.Boolean()),
+    ('ai_drainage_visible', 'drainage_area_visible', sa.Boolean()),
+    ('ai_appears_recent', 'appears_recent', sa.Boolean()),
+    ('ai_appears_screenshot', 'appears_screenshot', sa.Boolean()),
+    ('ai_issues', 'issues', JSONB()),
+    ('ai_summary', 'summary', sa.Text()),
+]
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Verifica si una columna ya existe en la tabla."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def upgrade() -> None:
+    """Eliminar columnas duplicadas de validación IA."""
+    for column_name, _, _ in AI_COLUMNS:
+        if column_exists('compliance_records', column_name):
+            op.drop_column('compliance_records', column_name)
+
+
+def downgrade() -> None:
+    """Restaurar columnas de validación IA desde ai_validation."""
+    for column_name, key, column_type in AI_COLUMNS:
+        if not column_exists('compliance_records', column_name):
+            op.add_column('compliance_records', sa.Column(column_name, column_type, nullable=True))
+
+        if isinstance(column_type, JSONB):
+            value = f"ai_validation -> '{key}'"
+        else:
+            value = f"(ai_validation ->> '{key}')::{column_type.compile(dialect=op.get_bind().dialect)}"
+        op.execute(
+            f"UPDATE compliance_records SET {column_name} = {value} "
+            f"WHERE ai_validation IS NOT NULL"
+        )
@@ -0,0 +1,40 @@
+"""Set server-side defaults for created_at/updated_at.
+
+Revision ID: 008_server_side_timestamps
+Revises: 007_drop_ai_validation_columns
+Create Date: 2026-10-16
+
+Clients, contacts y compliance_records ahora dejan que Postgres estampe
+created_at/updated_at (timezone('utc', now())) en lugar de calcularlos en
+Python. Las columnas siguen siendo TIMESTAMP sin zona horaria.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '008_server_side_timestamps'
+down_revision = '007_drop_ai_validation_columns'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('clients', 'contacts', 'compliance_records')
+COLUMNS = ('created_at', 'updated_at')
+
+
+def upgrade() -> None:
+    """Agregar defaults de servidor a los timestamps."""
+    for table_name in TABLES:
+        op.execute(f"ALTER TABLE {table_name} " + ", ".join(
+            f"ALTER COLUMN {column_name} SET DEFAULT timezone('utc', now())"
+            for column_name in COLUMNS
+        ))
+
+
+def downgrade() -> None:
+    """Quitar defaults de servidor de los timestamps."""
+    for table_name in TABLES:
+        op.execute(f"ALTER TABLE {table_name} " + ", ".join(
+            f"ALTER COLUMN {column_name} DROP DEFAULT"
+            for column_name in COLUMNS
+        ))
@@ -0,0 +1,62 @@
+"""Add composite and partial indexes on compliance_records.
+
+Revision ID: 009_compliance_indexes
+Revises: 008_server_side_timestamps
+Create Date: 2026-10-16
+
+Agrega índices para los patrones de consulta del dashboard:
+- (location_id, created_at DESC): historial por ubicación y reportes
+- created_at WHERE is_valid IS NULL: cola de registros por validar
+
+Se crean con CONCURRENTLY para no bloquear inserts de fotos.
+"""
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+# revision identifiers, used by Alembic.
+revision = '009_compliance_indexes'
+down_revision = '008_server_side_timestamps'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    """Verifica si un índice ya existe en la tabla."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [ix['name'] for ix in inspector.get_indexes(table_name)]
+
+
+def upgrade() -> None:
+    """Crear índices de compliance_records."""
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        if not index_exists('compliance_records', 'ix_compliance_records_location_created'):
+            op.create_index(
+                'ix_compliance_records_location_created',
+                'compliance_records',
+                ['location_id', text('created_at DESC')],
+                postgresql_concurrently=True
+            )
+
+        if not index_exists('compliance_records', 'ix_compliance_records_pending'):
+            op.create_index(
+                'ix_compliance_records_pending',
+                'compliance_records',
+                ['created_at'],
+                postgresql_where=text("is_valid IS NULL"),
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Eliminar índices de compliance_records."""
+    with op.get_context().autocommit_block():
+        for index_name in ('ix_compliance_records_pending', 'ix_compliance_records_location_created'):
+            if index_exists('compliance_records', index_name):
+                op.drop_index(
+                    index_name,
+                    table_name='compliance_records',
+                    postgresql_concurrently=True
+                )
@@ -0,0 +1,37 @@
+"""Add composite index on contacts (client_id, role).
+
+Revision ID: 010_contacts_client_role_index
+Revises: 009_compliance_indexes
+Create Date: 2026-10-16
+
+Los escalamientos del scheduler y las notificaciones de pedidos buscan
+los ADMIN/SUPERVISOR de un cliente: client_id = X AND role IN (...).
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '010_contacts_client_role_index'
+down_revision = '009_compliance_indexes'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    """Verifica si un índice ya existe en la tabla."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [ix['name'] for ix in inspector.get_indexes(table_name)]
+
+
+def upgrade() -> None:
+    """Crear índice (client_id, role) en contacts."""
+    if not index_exists('contacts', 'ix_contacts_client_role'):
+        op.create_index('ix_contacts_client_role', 'contacts', ['client_id', 'role'])
+
+
+def downgrade() -> None:
+    """Eliminar índice (client_id, role) de contacts."""
+    if index_exists('contacts', 'ix_contacts_client_role'):
+        op.drop_index('ix_contacts_client_role', table_name='contacts')
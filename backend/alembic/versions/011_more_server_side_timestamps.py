@@ -0,0 +1,47 @@
+"""Set server-side timestamp defaults on the remaining tables.
+
+Revision ID: 011_more_server_side_timestamps
+Revises: 010_contacts_client_role_index
+Create Date: 2026-10-16
+
+Extiende 008_server_side_timestamps a locations, products,
+scheduled_reminders, product_orders, evaluation_templates y
+self_evaluations: Postgres estampa created_at/updated_at con
+timezone('utc', now()) y los modelos dejan de llamar a datetime.utcnow.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '011_more_server_side_timestamps'
+down_revision = '010_contacts_client_role_index'
+branch_labels = None
+depends_on = None
+
+
+TABLE_COLUMNS = {
+    'locations': ('created_at', 'updated_at'),
+    'products': ('created_at', 'updated_at'),
+    'scheduled_reminders': ('created_at', 'updated_at'),
+    'product_orders': ('created_at', 'updated_at'),
+    'evaluation_templates': ('created_at', 'updated_at'),
+    'self_evaluations': ('created_at',),
+}
+
+
+def upgrade() -> None:
+    """Agregar defaults de servidor a los timestamps."""
+    for table_name, columns in TABLE_COLUMNS.items():
+        op.execute(f"ALTER TABLE {table_name} " + ", ".join(
+            f"ALTER COLUMN {column_name} SET DEFAULT timezone('utc', now())"
+            for column_name in columns
+        ))
+
+
+def downgrade() -> None:
+    """Quitar defaults de servidor de los timestamps."""
+    for table_name, columns in TABLE_COLUMNS.items():
+        op.execute(f"ALTER TABLE {table_name} " + ", ".join(
+            f"ALTER COLUMN {column_name} DROP DEFAULT"
+            for column_name in columns
+        ))
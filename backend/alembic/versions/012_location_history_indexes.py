@@ -0,0 +1,64 @@
+"""Add (location_id, date DESC) indexes for per-location history.
+
+Revision ID: 012_location_history_indexes
+Revises: 011_more_server_side_timestamps
+Create Date: 2026-10-16
+
+Los listados filtrados por ubicación ordenan por fecha descendente y
+paginan con LIMIT; con estos índices Postgres recorre sólo las filas
+de la página en lugar de ordenar todas las de la ubicación:
+- self_evaluations (location_id, created_at DESC)
+- product_orders (location_id, created_at DESC)
+- scheduled_reminders (location_id, scheduled_for DESC)
+
+Se crean con CONCURRENTLY para no bloquear escrituras.
+"""
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+# revision identifiers, used by Alembic.
+revision = '012_location_history_indexes'
+down_revision = '011_more_server_side_timestamps'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_self_evaluations_location_created', 'self_evaluations', 'created_at DESC'),
+    ('ix_product_orders_location_created', 'product_orders', 'created_at DESC'),
+    ('ix_scheduled_reminders_location_scheduled', 'scheduled_reminders', 'scheduled_for DESC'),
+)
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    """Verifica si un índice ya existe en la tabla."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [ix['name'] for ix in inspector.get_indexes(table_name)]
+
+
+def upgrade() -> None:
+    """Crear índices de historial por ubicación."""
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        for index_name, table_name, order_column in INDEXES:
+            if not index_exists(table_name, index_name):
+                op.create_index(
+                    index_name,
+                    table_name,
+                    ['location_id', text(order_column)],
+                    postgresql_concurrently=True
+                )
+
+
+def downgrade() -> None:
+    """Eliminar índices de historial por ubicación."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _ in reversed(INDEXES):
+            if index_exists(table_name, index_name):
+                op.drop_index(
+                    index_name,
+                    table_name=table_name,
+                    postgresql_concurrently=True
+                )
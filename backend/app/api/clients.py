@@ -4,7 +4,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from typing import Optional
-import math
 
 from app.database import get_db
 from app.models.client import Client, BusinessType
@@ -51,12 +50,11 @@ async def list_clients(
     result = await db.execute(query)
     clients = result.scalars().all()
 
-    return ClientList(
-        items=[ClientResponse.model_validate(c) for c in clients],
+    return ClientList.build(
+        items=[ClientResponse.from_orm_trusted(c) for c in clients],
         total=total,
         page=page,
-        page_size=page_size,
-        pages=math.ceil(total / page_size) if total > 0 else 1
+        page_size=page_size
     )
 
 
@@ -170,7 +168,7 @@ async def get_client_locations(
     result = await db.execute(query.order_by(Location.name))
     locations = result.scalars().all()
 
-    return [LocationResponse.model_validate(loc) for loc in locations]
+    return [LocationResponse.from_orm_trusted(loc) for loc in locations]
 
 
 @router.get("/{client_id}/contacts")
@@ -197,4 +195,4 @@ async def get_client_contacts(
     result = await db.execute(query.order_by(Contact.name))
     contacts = result.scalars().all()
 
-    return [ContactResponse.model_validate(c) for c in contacts]
+    return [ContactResponse.from_orm_trusted(c) for c in contacts]
@@ -6,7 +6,6 @@ from sqlalchemy import select, func, and_
 from typing import Optional
 from datetime import datetime, timedelta
 from functools import lru_cache
-import math
 import base64
 import httpx
 import logging
@@ -95,12 +94,11 @@ async def list_compliance_records(
     result = await db.execute(query)
     records = result.scalars().all()
 
-    return ComplianceList(
-        items=[ComplianceResponse.model_validate(r) for r in records],
+    return ComplianceList.build(
+        items=[ComplianceResponse.from_orm_trusted(r) for r in records],
         total=total,
         page=page,
-        page_size=page_size,
-        pages=math.ceil(total / page_size) if total > 0 else 1
+        page_size=page_size
     )
 
 
@@ -278,12 +276,11 @@ async def list_reminders(
     result = await db.execute(query)
     reminders = result.scalars().all()
 
-    return ReminderList(
-        items=[ReminderResponse.model_validate(r) for r in reminders],
+    return ReminderList.build(
+        items=[ReminderResponse.from_orm_trusted(r) for r in reminders],
         total=total,
         page=page,
-        page_size=page_size,
-        pages=math.ceil(total / page_size) if total > 0 else 1
+        page_size=page_size
     )
 
 
@@ -4,7 +4,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import Optional
 from datetime import datetime, timedelta
-import math
 
 from app.database import get_db
 from app.models.contact import Contact, ContactRole
@@ -59,12 +58,11 @@ async def list_contacts(
     result = await db.execute(query)
     contacts = result.scalars().all()
 
-    return ContactList(
-        items=[ContactResponse.model_validate(c) for c in contacts],
+    return ContactList.build(
+        items=[ContactResponse.from_orm_trusted(c) for c in contacts],
         total=total,
         page=page,
-        page_size=page_size,
-        pages=math.ceil(total / page_size) if total > 0 else 1
+        page_size=page_size
     )
 
 
@@ -11,7 +11,7 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 from sqlalchemy import select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, defer, undefer
 
 from app.database import get_db
 from app.models.evaluation import EvaluationTemplate, SelfEvaluation
@@ -315,7 +315,9 @@ async def list_evaluations(
         select(SelfEvaluation)
         .options(
             selectinload(SelfEvaluation.location),
-            selectinload(SelfEvaluation.contact)
+            selectinload(SelfEvaluation.contact),
+            # El listado no devuelve las respuestas; firma y fotos ya son diferidas
+            defer(SelfEvaluation.answers)
         )
     )
 
@@ -361,7 +363,9 @@ async def get_evaluation(evaluation_id: int, db: AsyncSession = Depends(get_db))
         .options(
             selectinload(SelfEvaluation.location),
             selectinload(SelfEvaluation.contact),
-            selectinload(SelfEvaluation.template)
+            selectinload(SelfEvaluation.template),
+            undefer(SelfEvaluation.photos),
+            undefer(SelfEvaluation.signature_data)
         )
         .where(SelfEvaluation.id == evaluation_id)
     )
@@ -3,11 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import Optional
-import math
 
 from app.database import get_db
 from app.models.location import Location
 from app.models.client import Client
+from app.services.location_cache import invalidate_location
 from app.schemas.location import (
     LocationCreate, LocationUpdate, LocationResponse, LocationList
 )
@@ -50,12 +50,11 @@ async def list_locations(
     result = await db.execute(query)
     locations = result.scalars().all()
 
-    return LocationList(
-        items=[LocationResponse.model_validate(loc) for loc in locations],
+    return LocationList.build(
+        items=[LocationResponse.from_orm_trusted(loc) for loc in locations],
         total=total,
         page=page,
-        page_size=page_size,
-        pages=math.ceil(total / page_size) if total > 0 else 1
+        page_size=page_size
     )
 
 
@@ -143,6 +142,7 @@ async def update_location(
 
     await db.flush()
     await db.refresh(location)
+    invalidate_location(location_id)
 
     return LocationResponse.model_validate(location)
 
@@ -168,6 +168,7 @@ async def delete_location(
         location.active = False
 
     await db.flush()
+    invalidate_location(location_id)
     return None
 
 
@@ -198,4 +199,4 @@ async def get_location_compliance_history(
     result = await db.execute(query)
     records = result.scalars().all()
 
-    return [ComplianceResponse.model_validate(r) for r in records]
+    return [ComplianceResponse.from_orm_trusted(r) for r in records]
@@ -2,13 +2,12 @@
 import logging
 from datetime import datetime
 from typing import Optional
-from math import ceil
 import base64
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
 
 from app.database import get_db
 from app.models import ProductOrder, OrderStatus, Contact, Location, Client, Product
@@ -198,7 +197,7 @@ async def list_orders(
             )
             client = client_result.scalar_one_or_none()
 
-        items.append(OrderWithDetails(
+        items.append(OrderWithDetails.model_construct(
             id=order.id,
             location_id=order.location_id,
             contact_id=order.contact_id,
@@ -226,12 +225,11 @@ async def list_orders(
             reviewed_by_name=order.reviewed_by.name if order.reviewed_by else None,
         ))
 
-    return OrderList(
+    return OrderList.build(
         items=items,
         total=total,
         page=page,
-        page_size=page_size,
-        pages=ceil(total / page_size) if total > 0 else 1
+        page_size=page_size
     )
 
 
@@ -473,7 +471,9 @@ async def get_order_signature(
 ):
     """Devuelve la imagen de la firma como PNG."""
     result = await db.execute(
-        select(ProductOrder).where(ProductOrder.id == order_id)
+        select(ProductOrder)
+        .options(undefer(ProductOrder.signature_data))
+        .where(ProductOrder.id == order_id)
     )
     order = result.scalar_one_or_none()
 
@@ -6,6 +6,7 @@ from typing import Optional
 
 from app.database import get_db
 from app.models.product import Product
+from app.services.location_cache import invalidate_location
 from app.schemas.product import (
     ProductCreate, ProductUpdate, ProductResponse, ProductList
 )
@@ -40,7 +41,7 @@ async def list_products(
     products = result.scalars().all()
 
     return ProductList(
-        items=[ProductResponse.model_validate(p) for p in products],
+        items=[ProductResponse.from_orm_trusted(p) for p in products],
         total=len(products)
     )
 
@@ -190,6 +191,7 @@ async def update_product(
 
     await db.flush()
     await db.refresh(product)
+    invalidate_location()  # El producto puede estar en varias ubicaciones
 
     return ProductResponse.model_validate(product)
 
@@ -215,4 +217,5 @@ async def delete_product(
         product.active = False
 
     await db.flush()
+    invalidate_location()
     return None
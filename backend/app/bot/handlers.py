@@ -38,11 +38,6 @@ WAITING_LOCATION_FOR_PHOTO = 4  # Esperando ubicación antes de foto
 
 # ==================== HELPERS ====================
 
-async def get_db_session() -> AsyncSession:
-    """Obtiene una sesión de base de datos."""
-    return AsyncSessionLocal()
-
-
 async def get_contact_by_telegram_id(telegram_id: str, db: AsyncSession) -> Contact | None:
     """Busca un contacto por su ID de Telegram."""
     result = await db.execute(
@@ -52,10 +47,15 @@ async def get_contact_by_telegram_id(telegram_id: str, db: AsyncSession) -> Cont
 
 
 async def get_contact_by_invite_code(code: str, db: AsyncSession) -> Contact | None:
-    """Busca un contacto por su código de invitación."""
+    """
+    Busca un contacto por su código de invitación.
+
+    Los códigos se guardan en mayúsculas (ver Contact._normalize_invite_code),
+    así que `code` debe llegar ya normalizado por el handler.
+    """
     result = await db.execute(
         select(Contact).where(
-            Contact.invite_code == code.upper(),
+            Contact.invite_code == code,
             Contact.telegram_id.is_(None),  # No vinculado aún
             Contact.active == True
         )
@@ -1026,11 +1026,14 @@ async def start_bot():
             # Configurar webhook en Telegram
             async with httpx.AsyncClient() as client:
                 set_webhook_url = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/setWebhook"
-                response = await client.post(set_webhook_url, json={
+                webhook_params = {
                     "url": webhook_url,
                     "allowed_updates": ["message", "callback_query"],
                     "drop_pending_updates": True
-                })
+                }
+                if settings.TELEGRAM_WEBHOOK_SECRET:
+                    webhook_params["secret_token"] = settings.TELEGRAM_WEBHOOK_SECRET
+                response = await client.post(set_webhook_url, json=webhook_params)
                 result = response.json()
                 logger.info(f"Webhook setup response: {result}")
 
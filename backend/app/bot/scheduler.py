@@ -3,33 +3,51 @@ Scheduler de Recordatorios para Biorem Compliance.
 
 Usa APScheduler para programar y enviar recordatorios automáticamente.
 """
+import asyncio
 import logging
 from datetime import datetime, timedelta, time
+from functools import lru_cache
+from time import monotonic
 from typing import Optional
+from apscheduler.executors.asyncio import AsyncIOExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert, update, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from telegram import Bot
 
 from app.config import settings
 from app.database import AsyncSessionLocal
+from app.models.client import Client
 from app.models.location import Location
 from app.models.contact import Contact
 from app.models.reminder import ScheduledReminder, ReminderStatus
 from app.models.notification import NotificationLog, NotificationType
+from app.services.location_cache import LocationSnapshot, get_location_snapshot, preload_locations
 
 logger = logging.getLogger(__name__)
 
+# Formato de los mensajes de recordatorio
+TELEGRAM_MESSAGE_LIMIT = 4096
+REMINDER_HEADER = "Recordatorio de aplicación\n\n"
+REMINDER_SEPARATOR = "\n\n---\n\n"
+REMINDER_SECTION_TEMPLATE = "Ubicación: {location_name}\nProducto: {product_name}{instructions}"
+REMINDER_FOOTER = "\n\nPor favor, aplica el producto y envía una foto de evidencia."
+
+# Hora de envío cuando la ubicación no tiene una configurada
+DEFAULT_REMINDER_TIME = time(9, 0)
+
+# Escritura en lote de NotificationLog
+LOG_FLUSH_MAX_ROWS = 500
+LOG_FLUSH_INTERVAL_SECONDS = 1.0
+
 # Scheduler global
 scheduler: Optional[AsyncIOScheduler] = None
 bot: Optional[Bot] = None
-
-
-async def get_db_session() -> AsyncSession:
-    """Obtiene una sesión de base de datos."""
-    return AsyncSessionLocal()
+_log_queue: asyncio.Queue = asyncio.Queue()
+_log_writer_task: Optional[asyncio.Task] = None
 
 
 # ==================== GENERACIÓN DE RECORDATORIOS ====================
@@ -43,80 +61,87 @@ async def generate_daily_reminders():
     """
     logger.info("Generating daily reminders...")
 
-    async with await get_db_session() as db:
+    async with AsyncSessionLocal() as db:
         today = datetime.utcnow().date()
+        day_start = datetime.combine(today, time(0, 0))
+        day_end = day_start + timedelta(days=1)
 
-        # Obtener ubicaciones activas que necesitan recordatorio hoy
+        today_weekday = str(today.isoweekday())  # 1=Lunes, 7=Domingo
+
+        # Obtener ubicaciones activas que necesitan recordatorio hoy, con los
+        # contactos de su cliente en una sola pasada. La frecuencia y los
+        # días de recordatorio se filtran en SQL.
         result = await db.execute(
             select(Location)
+            .options(selectinload(Location.client).selectinload(Client.contacts))
             .where(Location.active == True)
             .where(Location.product_id.isnot(None))
+            .where(or_(
+                Location.last_compliance_at.is_(None),
+                func.date(Location.last_compliance_at) + Location.frequency_days <= today
+            ))
+            .where(or_(
+                Location.reminder_days.is_(None),
+                Location.reminder_days == "",
+                Location.reminder_days.contains(today_weekday)
+            ))
         )
         locations = result.scalars().all()
 
-        reminders_created = 0
-
-        for location in locations:
-            # Verificar si toca recordatorio hoy según frecuencia
-            if location.last_compliance_at:
-                days_since = (today - location.last_compliance_at.date()).days
-                if days_since < location.frequency_days:
-                    continue  # Aún no toca
-
-            # Verificar si el día de hoy está en los días de recordatorio
-            today_weekday = str(today.isoweekday())  # 1=Lunes, 7=Domingo
-            if location.reminder_days and today_weekday not in location.reminder_days:
-                continue  # Hoy no toca recordatorio
-
-            # Obtener contactos del cliente para esta ubicación
-            result = await db.execute(
-                select(Contact)
-                .where(
-                    Contact.client_id == location.client_id,
-                    Contact.active == True,
-                    Contact.telegram_id.isnot(None)
-                )
+        # Ubicaciones que ya tienen recordatorio para hoy (una sola consulta)
+        result = await db.execute(
+            select(ScheduledReminder.location_id)
+            .where(
+                ScheduledReminder.scheduled_for >= day_start,
+                ScheduledReminder.scheduled_for < day_end,
+                ScheduledReminder.status != ReminderStatus.CANCELLED
             )
-            contacts = result.scalars().all()
-
-            if not contacts:
-                logger.warning(f"No linked contacts for location {location.id}")
-                continue
-
-            # Crear recordatorio para el primer contacto disponible
-            contact = contacts[0]
+        )
+        existing_location_ids = set(result.scalars().all())
 
-            # Calcular hora de envío
-            reminder_time = location.reminder_time or time(9, 0)
-            scheduled_for = datetime.combine(today, reminder_time)
+        reminder_rows = []
+        # Primer contacto vinculado por cliente; se calcula una vez por
+        # cliente aunque tenga muchas ubicaciones
+        contact_by_client: dict[int, Optional[Contact]] = {}
 
+        for location in locations:
             # Verificar que no exista ya un recordatorio para hoy
-            result = await db.execute(
-                select(ScheduledReminder)
-                .where(
-                    ScheduledReminder.location_id == location.id,
-                    ScheduledReminder.scheduled_for >= datetime.combine(today, time(0, 0)),
-                    ScheduledReminder.scheduled_for < datetime.combine(today + timedelta(days=1), time(0, 0)),
-                    ScheduledReminder.status != ReminderStatus.CANCELLED
+            if location.id in existing_location_ids:
+                continue
+
+            client_id = location.client_id
+            if client_id not in contact_by_client:
+                contact_by_client[client_id] = next(
+                    (
+                        c for c in location.client.contacts
+                        if c.active and c.telegram_id is not None
+                    ),
+                    None
                 )
-            )
-            existing = result.scalar_one_or_none()
 
-            if existing:
-                continue  # Ya existe recordatorio para hoy
+            # Crear recordatorio para el primer contacto disponible
+            contact = contact_by_client[client_id]
 
-            # Crear el recordatorio
-            reminder = ScheduledReminder(
-                location_id=location.id,
-                contact_id=contact.id,
-                scheduled_for=scheduled_for,
-                status=ReminderStatus.PENDING
-            )
-            db.add(reminder)
-            reminders_created += 1
+            if not contact:
+                logger.warning(f"No linked contacts for location {location.id}")
+                continue
 
+            # Calcular hora de envío
+            scheduled_for = datetime.combine(today, location.reminder_time or DEFAULT_REMINDER_TIME)
+
+            reminder_rows.append({
+                "location_id": location.id,
+                "contact_id": contact.id,
+                "scheduled_for": scheduled_for,
+                "status": ReminderStatus.PENDING,
+            })
+
+        # Insertar todos los recordatorios en un solo executemany; las filas
+        # no se usan después, así que no pasan por el identity map del ORM
+        if reminder_rows:
+            await db.execute(ScheduledReminder.__table__.insert(), reminder_rows)
         await db.commit()
-        logger.info(f"Created {reminders_created} reminders for today")
+        logger.info(f"Created {len(reminder_rows)} reminders for today")
 
 
 # ==================== ENVÍO DE RECORDATORIOS ====================
@@ -125,7 +150,13 @@ async def send_pending_reminders():
     """
     Envía los recordatorios pendientes que ya pasaron su hora programada.
 
-    Se ejecuta cada minuto para verificar y enviar recordatorios.
+    Se ejecuta cada minuto para verificar y enviar recordatorios. El tamaño
+    del lote crece con el backlog (hasta REMINDER_MAX_BATCH) y se siguen
+    procesando lotes hasta vaciarlo o agotar REMINDER_SEND_BUDGET_SECONDS.
+
+    Cada lote se reclama de forma atómica (PENDING -> SENDING con
+    FOR UPDATE SKIP LOCKED), así dos instancias del scheduler nunca
+    envían el mismo recordatorio.
     """
     if not bot:
         logger.warning("Bot not initialized, skipping reminder send")
@@ -133,25 +164,107 @@ async def send_pending_reminders():
 
     now = datetime.utcnow()
     logger.debug(f"Checking pending reminders at {now}")
+    deadline = monotonic() + settings.REMINDER_SEND_BUDGET_SECONDS
 
-    async with await get_db_session() as db:
-        # Obtener recordatorios pendientes que ya pasaron su hora
-        result = await db.execute(
-            select(ScheduledReminder)
+    due_filter = and_(
+        ScheduledReminder.status == ReminderStatus.PENDING,
+        ScheduledReminder.scheduled_for <= now
+    )
+
+    async with AsyncSessionLocal() as db:
+        # Liberar recordatorios que quedaron en SENDING porque la instancia
+        # que los reclamó se cayó a mitad del envío
+        stale_before = now - timedelta(minutes=settings.REMINDER_CLAIM_TIMEOUT_MINUTES)
+        await db.execute(
+            update(ScheduledReminder)
             .where(
-                ScheduledReminder.status == ReminderStatus.PENDING,
-                ScheduledReminder.scheduled_for <= now
+                ScheduledReminder.status == ReminderStatus.SENDING,
+                ScheduledReminder.updated_at < stale_before
             )
-            .limit(50)  # Procesar en lotes
+            .values(status=ReminderStatus.PENDING)
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await db.execute(
+            select(func.count()).select_from(ScheduledReminder).where(due_filter)
+        )
+        pending_count = result.scalar_one()
+        await db.commit()
+
+    if not pending_count:
+        return
+
+    batch_size = min(
+        max(settings.REMINDER_BATCH_SIZE, pending_count // 5),
+        settings.REMINDER_MAX_BATCH
+    )
+    logger.info(f"Found {pending_count} pending reminders to send (batch size {batch_size})")
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            # Reclamar el lote; las filas bloqueadas por otra instancia se saltan
+            claimable = (
+                select(ScheduledReminder.id)
+                .where(due_filter)
+                .order_by(ScheduledReminder.scheduled_for)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                update(ScheduledReminder)
+                .where(ScheduledReminder.id.in_(claimable))
+                .values(status=ReminderStatus.SENDING)
+                .returning(ScheduledReminder.id)
+                .execution_options(synchronize_session=False)
+            )
+            reminder_ids = result.scalars().all()
+            await db.commit()
+
+        if not reminder_ids:
+            break
+
+        try:
+            await _send_reminder_batch(reminder_ids)
+        except Exception as e:
+            # El envío se revirtió: devolver el lote a PENDING ahora en vez de
+            # esperar a que venza REMINDER_CLAIM_TIMEOUT_MINUTES
+            logger.error(f"Error sending batch of {len(reminder_ids)} reminders: {e}")
+            await _release_reminder_batch(reminder_ids)
+
+        if len(reminder_ids) < batch_size or monotonic() >= deadline:
+            break
+
+
+async def _send_reminder_batch(reminder_ids: list[int]):
+    """Carga un lote de recordatorios reclamados y los envía."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(ScheduledReminder)
+            .options(joinedload(ScheduledReminder.contact))
+            .where(ScheduledReminder.id.in_(reminder_ids))
         )
         reminders = result.scalars().all()
 
-        logger.info(f"Found {len(reminders)} pending reminders to send")
+        try:
+            await deliver_reminders(reminders, db)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
 
-        for reminder in reminders:
-            logger.info(f"Sending reminder {reminder.id} scheduled for {reminder.scheduled_for}")
-            await send_reminder(reminder, db)
 
+async def _release_reminder_batch(reminder_ids: list[int]):
+    """Devuelve a PENDING los recordatorios de un lote cuyo envío falló."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(ScheduledReminder)
+            .where(
+                ScheduledReminder.id.in_(reminder_ids),
+                ScheduledReminder.status == ReminderStatus.SENDING
+            )
+            .values(status=ReminderStatus.PENDING)
+            .execution_options(synchronize_session=False)
+        )
         await db.commit()
 
 
@@ -166,9 +279,11 @@ async def send_reminder_immediately(reminder_id: int) -> bool:
         logger.error("Bot not initialized, cannot send immediate reminder")
         return False
 
-    async with await get_db_session() as db:
+    async with AsyncSessionLocal() as db:
         result = await db.execute(
-            select(ScheduledReminder).where(ScheduledReminder.id == reminder_id)
+            select(ScheduledReminder)
+            .options(joinedload(ScheduledReminder.contact))
+            .where(ScheduledReminder.id == reminder_id)
         )
         reminder = result.scalar_one_or_none()
 
@@ -183,82 +298,167 @@ async def send_reminder_immediately(reminder_id: int) -> bool:
 
 
 async def send_reminder(reminder: ScheduledReminder, db: AsyncSession):
-    """Envía un recordatorio específico."""
+    """
+    Envía un recordatorio específico.
+
+    El recordatorio debe venir con `contact` ya cargado (joinedload);
+    la ubicación y el producto se leen de la caché de ubicaciones.
+    """
     try:
-        # Obtener contacto
-        result = await db.execute(
-            select(Contact).where(Contact.id == reminder.contact_id)
-        )
-        contact = result.scalar_one_or_none()
+        await deliver_reminders([reminder], db)
+    except Exception as e:
+        logger.error(f"Error sending reminder {reminder.id}: {e}")
+        reminder.status = ReminderStatus.FAILED
+        reminder.failure_reason = str(e)[:255]
+
+
+@lru_cache(maxsize=2048)
+def _build_reminder_section(location: LocationSnapshot) -> str:
+    """
+    Construye la parte del mensaje correspondiente a una ubicación.
+
+    Se cachea por snapshot: como el snapshot incluye nombre, producto,
+    instrucciones y dosis, editar el producto genera otra clave y no hace
+    falta invalidar la caché.
+    """
+    product_name = "el producto"
+    instructions = ""
+
+    if location.product_name:
+        product_name = location.product_name
+        if location.application_instructions:
+            instructions = f"\n\nInstrucciones:\n{location.application_instructions}"
+        if location.dosage:
+            instructions += f"\nDosis: {location.dosage}"
+
+    return REMINDER_SECTION_TEMPLATE.format(
+        location_name=location.name,
+        product_name=product_name,
+        instructions=instructions
+    )
+
+
+def _pack_reminder_messages(
+    items: list[tuple[ScheduledReminder, LocationSnapshot]]
+) -> list[tuple[list[tuple[ScheduledReminder, LocationSnapshot]], str]]:
+    """
+    Junta las secciones de un mismo destinatario en mensajes de Telegram.
+
+    Retorna una lista de (items, texto); se abre un mensaje nuevo cuando
+    agregar otra sección excedería TELEGRAM_MESSAGE_LIMIT.
+    """
+    messages = []
+    current_items = []
+    current_sections = []
+    length = len(REMINDER_HEADER) + len(REMINDER_FOOTER)
+
+    for item in items:
+        section = _build_reminder_section(item[1])
+        added = len(section) + (len(REMINDER_SEPARATOR) if current_sections else 0)
+
+        if current_sections and length + added > TELEGRAM_MESSAGE_LIMIT:
+            messages.append((current_items, current_sections))
+            current_items, current_sections = [], []
+            length = len(REMINDER_HEADER) + len(REMINDER_FOOTER)
+            added = len(section)
+
+        current_items.append(item)
+        current_sections.append(section)
+        length += added
+
+    if current_sections:
+        messages.append((current_items, current_sections))
+
+    return [
+        (msg_items, REMINDER_HEADER + REMINDER_SEPARATOR.join(sections) + REMINDER_FOOTER)
+        for msg_items, sections in messages
+    ]
+
+
+async def deliver_reminders(reminders: list[ScheduledReminder], db: AsyncSession):
+    """
+    Envía recordatorios agrupando por destinatario.
+
+    Todos los recordatorios de un mismo chat de Telegram se envían en un
+    solo mensaje (o varios si excede el límite de caracteres), lo que evita
+    chocar con el límite de 1 msg/s por chat. Los envíos a chats distintos
+    van en paralelo, limitados por REMINDER_SEND_CONCURRENCY. Toda la
+    escritura en `db` ocurre al final, desde esta misma tarea.
+
+    Los recordatorios deben venir con `contact` ya cargado (joinedload).
+    """
+    groups: dict[str, list[tuple[ScheduledReminder, LocationSnapshot]]] = {}
+
+    for reminder in reminders:
+        contact = reminder.contact
 
         if not contact or not contact.telegram_id:
             logger.warning(f"Contact not found or not linked for reminder {reminder.id}")
             reminder.status = ReminderStatus.FAILED
             reminder.failure_reason = "Contact not linked"
-            return
+            continue
 
-        # Obtener ubicación y producto
-        result = await db.execute(
-            select(Location).where(Location.id == reminder.location_id)
-        )
-        location = result.scalar_one_or_none()
+        # Obtener ubicación y producto (desde la caché)
+        location = await get_location_snapshot(reminder.location_id, db)
 
         if not location:
             logger.warning(f"Location not found for reminder {reminder.id}")
             reminder.status = ReminderStatus.FAILED
             reminder.failure_reason = "Location not found"
-            return
-
-        product_name = "el producto"
-        instructions = ""
-
-        if location.product:
-            product_name = location.product.name
-            if location.product.application_instructions:
-                instructions = f"\n\nInstrucciones:\n{location.product.application_instructions}"
-            if location.product.dosage:
-                instructions += f"\nDosis: {location.product.dosage}"
-
-        # Construir mensaje
-        message = (
-            f"Recordatorio de aplicación\n\n"
-            f"Ubicación: {location.name}\n"
-            f"Producto: {product_name}"
-            f"{instructions}\n\n"
-            f"Por favor, aplica el producto y envía una foto de evidencia."
-        )
-
-        # Enviar mensaje (con timeout de 10 segundos para evitar bloqueos)
-        sent_message = await bot.send_message(
-            chat_id=contact.telegram_id,
-            text=message,
-            read_timeout=10,
-            write_timeout=10
-        )
-
-        # Actualizar recordatorio
-        reminder.mark_as_sent(str(sent_message.message_id))
-
-        # Registrar notificación
-        notification = NotificationLog(
-            contact_id=contact.id,
-            telegram_chat_id=contact.telegram_id,
-            reminder_id=reminder.id,
-            notification_type=NotificationType.REMINDER,
-            subject=f"Recordatorio: {location.name}",
-            message=message,
-            delivered=True,
-            delivered_at=datetime.utcnow(),
-            telegram_message_id=str(sent_message.message_id)
-        )
-        db.add(notification)
+            continue
+
+        groups.setdefault(contact.telegram_id, []).append((reminder, location))
+
+    messages = [
+        (chat_id, items, text)
+        for chat_id, group in groups.items()
+        for items, text in _pack_reminder_messages(group)
+    ]
+
+    semaphore = asyncio.Semaphore(settings.REMINDER_SEND_CONCURRENCY)
+
+    async def _send(chat_id: str, text: str):
+        async with semaphore:
+            # Timeout de 10 segundos para evitar bloqueos
+            return await bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                read_timeout=10,
+                write_timeout=10
+            )
 
-        logger.info(f"Sent reminder {reminder.id} to contact {contact.id}")
+    results = await asyncio.gather(
+        *(_send(chat_id, text) for chat_id, _, text in messages),
+        return_exceptions=True
+    )
 
-    except Exception as e:
-        logger.error(f"Error sending reminder {reminder.id}: {e}")
-        reminder.status = ReminderStatus.FAILED
-        reminder.failure_reason = str(e)[:255]
+    for (chat_id, items, text), outcome in zip(messages, results):
+        if isinstance(outcome, Exception):
+            for reminder, _ in items:
+                logger.error(f"Error sending reminder {reminder.id}: {outcome}")
+                reminder.status = ReminderStatus.FAILED
+                reminder.failure_reason = str(outcome)[:255]
+            continue
+
+        message_id = str(outcome.message_id)
+        for reminder, location in items:
+            # Actualizar recordatorio
+            reminder.mark_as_sent(message_id)
+
+            # Registrar notificación
+            queue_notification_log(db, {
+                "contact_id": reminder.contact.id,
+                "telegram_chat_id": chat_id,
+                "reminder_id": reminder.id,
+                "notification_type": NotificationType.REMINDER,
+                "subject": f"Recordatorio: {location.name}",
+                "message": text,
+                "delivered": True,
+                "delivered_at": datetime.utcnow(),
+                "telegram_message_id": message_id,
+            })
+
+            logger.info(f"Sent reminder {reminder.id} to contact {reminder.contact.id}")
 
 
 # ==================== ESCALAMIENTO ====================
@@ -275,10 +475,11 @@ async def check_escalations():
     now = datetime.utcnow()
     escalation_threshold = now - timedelta(minutes=settings.ESCALATION_MINUTES)
 
-    async with await get_db_session() as db:
+    async with AsyncSessionLocal() as db:
         # Obtener recordatorios enviados sin respuesta que pasaron el umbral
         result = await db.execute(
             select(ScheduledReminder)
+            .options(joinedload(ScheduledReminder.contact))
             .where(
                 ScheduledReminder.status == ReminderStatus.SENT,
                 ScheduledReminder.sent_at <= escalation_threshold,
@@ -294,13 +495,14 @@ async def check_escalations():
 
 
 async def escalate_reminder(reminder: ScheduledReminder, db: AsyncSession):
-    """Escala un recordatorio a un supervisor."""
+    """
+    Escala un recordatorio a un supervisor.
+
+    Igual que en send_reminder, `reminder.contact` debe venir precargado.
+    """
     try:
-        # Obtener ubicación
-        result = await db.execute(
-            select(Location).where(Location.id == reminder.location_id)
-        )
-        location = result.scalar_one_or_none()
+        # Obtener ubicación (desde la caché)
+        location = await get_location_snapshot(reminder.location_id, db)
 
         if not location:
             return
@@ -326,11 +528,7 @@ async def escalate_reminder(reminder: ScheduledReminder, db: AsyncSession):
             reminder.escalated_at = datetime.utcnow()
             return
 
-        # Obtener contacto original
-        result = await db.execute(
-            select(Contact).where(Contact.id == reminder.contact_id)
-        )
-        original_contact = result.scalar_one_or_none()
+        original_contact = reminder.contact
 
         # Enviar alerta al supervisor
         message = (
@@ -354,17 +552,17 @@ async def escalate_reminder(reminder: ScheduledReminder, db: AsyncSession):
         reminder.mark_as_escalated(supervisor.id)
 
         # Registrar notificación
-        notification = NotificationLog(
-            contact_id=supervisor.id,
-            telegram_chat_id=supervisor.telegram_id,
-            reminder_id=reminder.id,
-            notification_type=NotificationType.ESCALATION,
-            subject=f"Escalamiento: {location.name}",
-            message=message,
-            delivered=True,
-            delivered_at=datetime.utcnow()
-        )
-        db.add(notification)
+        queue_notification_log(db, {
+            "contact_id": supervisor.id,
+            "telegram_chat_id": supervisor.telegram_id,
+            "reminder_id": reminder.id,
+            "notification_type": NotificationType.ESCALATION,
+            "subject": f"Escalamiento: {location.name}",
+            "message": message,
+            "delivered": True,
+            "delivered_at": datetime.utcnow(),
+            "telegram_message_id": None,
+        })
 
         logger.info(f"Escalated reminder {reminder.id} to supervisor {supervisor.id}")
 
@@ -372,6 +570,60 @@ async def escalate_reminder(reminder: ScheduledReminder, db: AsyncSession):
         logger.error(f"Error escalating reminder {reminder.id}: {e}")
 
 
+# ==================== LOG DE NOTIFICACIONES ====================
+
+def queue_notification_log(db: AsyncSession, row: dict):
+    """
+    Registra una notificación enviada.
+
+    El log es sólo de auditoría, así que no se escribe en la transacción
+    del recordatorio: se encola y un worker lo inserta en lotes. Si el
+    worker no está corriendo se agrega a `db` como antes.
+    """
+    if _log_writer_task and not _log_writer_task.done():
+        _log_queue.put_nowait(row)
+    else:
+        db.add(NotificationLog(**row))
+
+
+async def _flush_notification_logs(rows: list[dict]):
+    """Inserta un lote de NotificationLog en una sola sentencia."""
+    if not rows:
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(NotificationLog), rows)
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Error writing {len(rows)} notification logs: {e}")
+
+
+async def _notification_log_writer():
+    """Vacía la cola de logs cada LOG_FLUSH_INTERVAL_SECONDS o LOG_FLUSH_MAX_ROWS filas."""
+    loop = asyncio.get_running_loop()
+    rows = []
+    try:
+        while True:
+            rows = [await _log_queue.get()]
+            deadline = loop.time() + LOG_FLUSH_INTERVAL_SECONDS
+            while len(rows) < LOG_FLUSH_MAX_ROWS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(_log_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await _flush_notification_logs(rows)
+            rows = []
+    except asyncio.CancelledError:
+        # Al detener el scheduler, escribir lo que quede antes de salir
+        while not _log_queue.empty():
+            rows.append(_log_queue.get_nowait())
+        await _flush_notification_logs(rows)
+        raise
+
+
 # ==================== CONFIGURACIÓN DEL SCHEDULER ====================
 
 def setup_scheduler(telegram_bot: Bot) -> AsyncIOScheduler:
@@ -379,7 +631,15 @@ def setup_scheduler(telegram_bot: Bot) -> AsyncIOScheduler:
     global scheduler, bot
 
     bot = telegram_bot
-    scheduler = AsyncIOScheduler()
+    scheduler = AsyncIOScheduler(
+        # Job store en memoria: los jobs se registran con ids fijos en cada arranque
+        executors={"default": AsyncIOExecutor()},
+        job_defaults={
+            "coalesce": True,  # Varias ejecuciones perdidas se corren una sola vez
+            "max_instances": 1,  # No solapar una ejecución lenta con la siguiente
+            "misfire_grace_time": 60,
+        }
+    )
 
     # Generar recordatorios diarios a las 00:01
     scheduler.add_job(
@@ -410,19 +670,32 @@ def setup_scheduler(telegram_bot: Bot) -> AsyncIOScheduler:
 
 async def start_scheduler(telegram_bot: Bot):
     """Inicia el scheduler."""
-    global scheduler
+    global scheduler, _log_writer_task
 
     scheduler = setup_scheduler(telegram_bot)
     scheduler.start()
+    _log_writer_task = asyncio.create_task(_notification_log_writer())
     logger.info("Scheduler started")
 
+    # Precargar ubicaciones para que los envíos no las consulten una a una
+    async with AsyncSessionLocal() as db:
+        await preload_locations(db)
+
     # Ejecutar generación de recordatorios al iniciar
     await generate_daily_reminders()
 
 
-def stop_scheduler():
-    """Detiene el scheduler."""
-    global scheduler
+async def stop_scheduler():
+    """Detiene el scheduler y escribe los logs de notificación pendientes."""
+    global scheduler, _log_writer_task
     if scheduler and scheduler.running:
         scheduler.shutdown()
         logger.info("Scheduler stopped")
+
+    if _log_writer_task:
+        _log_writer_task.cancel()
+        try:
+            await _log_writer_task
+        except asyncio.CancelledError:
+            pass
+        _log_writer_task = None
@@ -1,17 +1,34 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
-from typing import Optional
-from functools import lru_cache
+from typing import Literal, Optional
+from functools import cached_property
+import json
 
 
 class Settings(BaseSettings):
-    """Configuración de la aplicación usando Pydantic Settings."""
+    """
+    Configuración de la aplicación usando Pydantic Settings.
+
+    Es inmutable (frozen): se lee del entorno una sola vez al importar el
+    módulo, y los valores derivados se calculan en el primer acceso.
+    """
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        frozen=True,
+    )
 
     # Aplicación
     APP_NAME: str = "Biorem Compliance"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
     ENVIRONMENT: str = "development"
+    # "sync": migraciones, bot y scheduler se completan antes de aceptar
+    # requests; "async": corren en segundo plano y sólo /health/ready indica
+    # cuándo terminaron (requiere que el health check del deploy lo use)
+    MIGRATION_MODE: Literal["sync", "async"] = "sync"
 
     # Base de datos (Railway provee DATABASE_URL automáticamente)
     DATABASE_URL: str = Field(
@@ -27,6 +44,13 @@ class Settings(BaseSettings):
             return v.replace("postgresql://", "postgresql+asyncpg://", 1)
         return v
 
+    # Pool de conexiones (async_engine)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 300  # segundos; Railway cierra conexiones ociosas
+    DB_POOL_TIMEOUT: int = 30  # segundos
+    DB_STATEMENT_CACHE_SIZE: int = 500
+
     # Telegram Bot
     TELEGRAM_BOT_TOKEN: str = Field(
         default="",
@@ -36,6 +60,12 @@ class Settings(BaseSettings):
         default=None,
         description="URL para webhook de Telegram (para producción)"
     )
+    TELEGRAM_WEBHOOK_SECRET: Optional[str] = Field(
+        default=None,
+        description="secret_token del webhook; Telegram lo envía en cada update"
+    )
+    WEBHOOK_QUEUE_SIZE: int = 500  # Updates en espera antes de rechazar con 503
+    WEBHOOK_WORKERS: int = 8  # Updates procesándose a la vez
 
     # Telegram Web App
     WEBAPP_URL: str = Field(
@@ -72,6 +102,12 @@ class Settings(BaseSettings):
     DEFAULT_FREQUENCY_DAYS: int = 7
     ESCALATION_MINUTES: int = 120  # 2 horas sin respuesta
     MAX_ESCALATION_ATTEMPTS: int = 3
+    REMINDER_SEND_CONCURRENCY: int = 25  # Telegram permite ~30 msg/s globales
+    REMINDER_BATCH_SIZE: int = 500
+    REMINDER_MAX_BATCH: int = 5000
+    REMINDER_SEND_BUDGET_SECONDS: int = 45  # El job corre cada minuto
+    REMINDER_CLAIM_TIMEOUT_MINUTES: int = 10  # Libera envíos atascados en SENDING
+    LOCATION_CACHE_TTL_SECONDS: int = 300
 
     # Admin (puede ser JSON array o string separado por comas)
     ADMIN_TELEGRAM_IDS: str = Field(
@@ -79,18 +115,24 @@ class Settings(BaseSettings):
         description="IDs de Telegram de administradores (separados por coma)"
     )
 
-    @property
-    def admin_telegram_ids_list(self) -> list[int]:
-        """Retorna ADMIN_TELEGRAM_IDS como lista de enteros."""
+    @cached_property
+    def admin_telegram_ids(self) -> frozenset[int]:
+        """
+        Retorna ADMIN_TELEGRAM_IDS como frozenset de enteros.
+
+        Se calcula una sola vez; la pertenencia (`id in ...`) es O(1).
+        """
         if not self.ADMIN_TELEGRAM_IDS:
-            return []
+            return frozenset()
         try:
             # Intentar parsear como JSON primero
-            import json
-            return json.loads(self.ADMIN_TELEGRAM_IDS)
+            ids = json.loads(self.ADMIN_TELEGRAM_IDS)
+            if isinstance(ids, int):
+                ids = [ids]
         except (json.JSONDecodeError, TypeError):
             # Si falla, parsear como string separado por comas
-            return [int(id.strip()) for id in self.ADMIN_TELEGRAM_IDS.split(",") if id.strip()]
+            ids = [id.strip() for id in self.ADMIN_TELEGRAM_IDS.split(",") if id.strip()]
+        return frozenset(int(id) for id in ids)
 
     # CORS (para el frontend)
     # Puede ser string separado por comas o lista
@@ -99,23 +141,11 @@ class Settings(BaseSettings):
         description="Orígenes permitidos para CORS (separados por coma)"
     )
 
-    @property
-    def cors_origins_list(self) -> list[str]:
-        """Retorna CORS_ORIGINS como lista."""
-        if isinstance(self.CORS_ORIGINS, list):
-            return self.CORS_ORIGINS
-        return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
-
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-
-
-@lru_cache()
-def get_settings() -> Settings:
-    """Obtiene la configuración cacheada."""
-    return Settings()
+    @cached_property
+    def cors_origins(self) -> tuple[str, ...]:
+        """Retorna CORS_ORIGINS como tupla inmutable."""
+        return tuple(origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip())
 
 
-settings = get_settings()
+# Instancia única; importar `settings` en lugar de crear nuevas.
+settings = Settings()
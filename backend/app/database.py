@@ -1,28 +1,46 @@
-from sqlalchemy import create_engine
+from functools import lru_cache
+import orjson
+from sqlalchemy import create_engine, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from app.config import settings
 
-# Motor síncrono (para migraciones con Alembic)
-engine = create_engine(
-    settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"),
-    pool_pre_ping=True
-)
+# URL con driver síncrono (psycopg2) para Alembic
+SYNC_DATABASE_URL = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
 
 # Motor asíncrono (para la aplicación)
+# Un solo pool compartido por la API y el scheduler; el tamaño por defecto
+# de SQLAlchemy (5 + 10) se queda corto cuando coinciden ambos.
 async_engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    pool_pre_ping=True
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    # Columnas JSONB (evaluaciones, validación IA) con orjson
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
+    connect_args={
+        # Sin pool_pre_ping (un SELECT 1 por checkout): las conexiones se
+        # reciclan con pool_recycle y los sockets muertos se detectan por
+        # keepalive. Si aun así falla una, SQLAlchemy la marca como
+        # desconexión e invalida el pool.
+        "server_settings": {
+            "jit": "off",
+            "tcp_keepalives_idle": "30",
+            "tcp_keepalives_interval": "10",
+        },
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
 )
 
-# Sesión síncrona
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 # Sesión asíncrona
-AsyncSessionLocal = sessionmaker(
+AsyncSessionLocal = async_sessionmaker(
     async_engine,
     class_=AsyncSession,
     expire_on_commit=False
@@ -31,6 +49,18 @@ AsyncSessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+def utcnow_sql():
+    """
+    Hora UTC calculada por Postgres, para defaults de columnas DateTime
+    (sin zona horaria, igual que datetime.utcnow()).
+
+    Los modelos que la usan declaran `__mapper_args__ = {"eager_defaults": True}`
+    para traer los valores con RETURNING al insertar/actualizar: en async no
+    se pueden cargar perezosamente después.
+    """
+    return func.timezone("utc", func.now())
+
+
 async def get_db():
     """Dependency para obtener sesión de base de datos."""
     async with AsyncSessionLocal() as session:
@@ -44,9 +74,27 @@ async def get_db():
             await session.close()
 
 
+@lru_cache(maxsize=1)
+def get_sync_engine():
+    """
+    Motor síncrono (para migraciones con Alembic).
+
+    Se crea sólo la primera vez que se pide, así el proceso de la API no
+    lo construye si nunca lo usa. NullPool: no deja conexiones ociosas
+    abiertas junto al pool asíncrono.
+    """
+    return create_engine(SYNC_DATABASE_URL, poolclass=NullPool)
+
+
+@lru_cache(maxsize=1)
+def get_sync_sessionmaker() -> sessionmaker:
+    """Fábrica de sesiones síncronas sobre get_sync_engine()."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_sync_engine())
+
+
 def get_sync_db():
     """Dependency para obtener sesión síncrona (migraciones)."""
-    db = SessionLocal()
+    db = get_sync_sessionmaker()()
     try:
         yield db
     finally:
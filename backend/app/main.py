@@ -1,12 +1,24 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
+import hashlib
+import hmac
+import importlib
 import logging
 import os
+import time
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+import orjson
 
 from sqlalchemy import text
 from app.config import settings
 from app.database import async_engine, Base
+from app import models as _models  # noqa: F401 - registra los modelos en Base.metadata
 
 # Configurar logging
 logging.basicConfig(
@@ -16,19 +28,57 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Directorio backend (alembic.ini y scripts de migración)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@lru_cache(maxsize=1)
+def get_alembic_config():
+    """Config de Alembic; alembic.ini se lee una sola vez por proceso."""
+    from alembic.config import Config
+
+    alembic_cfg = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return alembic_cfg
+
+
+@lru_cache(maxsize=1)
+def get_alembic_head() -> str:
+    """Revisión head de los scripts de migración (se escanean una sola vez)."""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
 def run_migrations():
     """Ejecuta migraciones de Alembic al iniciar la aplicación."""
     try:
-        from alembic.config import Config
         from alembic import command
+        from alembic.runtime.migration import MigrationContext
+        from app.database import get_sync_engine
+
+        alembic_cfg = get_alembic_config()
+
+        # Una sola conexión para revisar la versión y, si hace falta, migrar
+        head = get_alembic_head()
+        with get_sync_engine().connect() as conn:
+            # Camino rápido: si la base ya está en head no hace falta correr Alembic
+            current = MigrationContext.configure(conn).get_current_revision()
+            if current == head:
+                logger.info(f"Database schema up to date ({head}), skipping migrations")
+                return True
+            # Cerrar la transacción de la lectura; env.py abre la suya
+            conn.rollback()
 
-        # Obtener la ruta del directorio backend
-        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        alembic_cfg = Config(os.path.join(backend_dir, "alembic.ini"))
-        alembic_cfg.set_main_option("script_location", os.path.join(backend_dir, "alembic"))
+            logger.info("Running database migrations...")
+            # El Config está cacheado: no dejarle la conexión al salir
+            alembic_cfg.attributes["connection"] = conn
+            try:
+                command.upgrade(alembic_cfg, "head")
+            finally:
+                alembic_cfg.attributes.pop("connection", None)
+            conn.commit()
 
-        logger.info("Running database migrations...")
-        command.upgrade(alembic_cfg, "head")
         logger.info("Database migrations completed successfully")
         return True
     except Exception as e:
@@ -37,64 +87,143 @@ def run_migrations():
         return False
 
 
+# Tabla de fixups de esquema aplicados fuera de Alembic
+SCHEMA_FIXUPS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_fixups (
+        version TEXT PRIMARY KEY,
+        applied_at TIMESTAMPTZ DEFAULT NOW()
+    )
+"""
+
+# Columnas de Photo Guard por tabla: (columna, tipo)
+PHOTO_GUARD_COLUMNS = {
+    # Contacts - Photo Guard location tracking
+    "contacts": [
+        ("last_known_latitude", "DOUBLE PRECISION"),
+        ("last_known_longitude", "DOUBLE PRECISION"),
+        ("last_location_at", "TIMESTAMP"),
+        ("last_location_accuracy", "DOUBLE PRECISION"),
+    ],
+    # Compliance Records - Photo Guard validation
+    "compliance_records": [
+        ("expected_latitude", "DOUBLE PRECISION"),
+        ("expected_longitude", "DOUBLE PRECISION"),
+        ("authenticity_score", "INTEGER"),
+        ("location_verified", "BOOLEAN"),
+        ("time_verified", "BOOLEAN"),
+        ("distance_from_expected", "DOUBLE PRECISION"),
+        ("time_diff_minutes", "INTEGER"),
+    ],
+}
+
+# Versión del fixup = huella de las columnas esperadas: si el código agrega
+# o cambia columnas, la versión cambia y el fixup se vuelve a aplicar
+PHOTO_GUARD_FIXUP_VERSION = "photo_guard_" + hashlib.sha256(
+    repr(sorted(PHOTO_GUARD_COLUMNS.items())).encode()
+).hexdigest()[:16]
+
+
+def _build_photo_guard_fixup_sql() -> str:
+    """
+    Arma un bloque DO que aplica el fixup de Photo Guard del lado del servidor.
+
+    Por cada tabla junta las columnas que faltan y ejecuta un solo ALTER TABLE
+    (un lock exclusivo por tabla, y ninguno si no falta nada); al final
+    registra la versión en schema_fixups.
+    """
+    lines = ["DO $$", "DECLARE", "    clauses text[];", "BEGIN"]
+
+    for table_name, cols in PHOTO_GUARD_COLUMNS.items():
+        lines.append("    clauses := '{}';")
+        for col, col_type in cols:
+            lines += [
+                "    IF NOT EXISTS (SELECT 1 FROM information_schema.columns",
+                f"                   WHERE table_name = '{table_name}' AND column_name = '{col}') THEN",
+                f"        clauses := array_append(clauses, 'ADD COLUMN {col} {col_type}');",
+                "    END IF;",
+            ]
+        if table_name == "compliance_records":
+            # Fix: Allow photos without pending reminder (location_id can be null)
+            lines += [
+                "    IF EXISTS (SELECT 1 FROM information_schema.columns",
+                "               WHERE table_name = 'compliance_records' AND column_name = 'location_id'",
+                "               AND is_nullable = 'NO') THEN",
+                "        clauses := array_append(clauses, 'ALTER COLUMN location_id DROP NOT NULL');",
+                "    END IF;",
+            ]
+        lines += [
+            "    IF array_length(clauses, 1) > 0 THEN",
+            f"        EXECUTE 'ALTER TABLE {table_name} ' || array_to_string(clauses, ', ');",
+            "    END IF;",
+        ]
+
+    lines += [
+        "    INSERT INTO schema_fixups (version)",
+        f"    VALUES ('{PHOTO_GUARD_FIXUP_VERSION}') ON CONFLICT DO NOTHING;",
+        "END $$",
+    ]
+    return "\n".join(lines)
+
+
+PHOTO_GUARD_FIXUP_SQL = _build_photo_guard_fixup_sql()
+
+# Evita repetir la verificación dentro del mismo proceso
+_PHOTO_GUARD_READY = False
+
+
+async def get_existing_columns(conn, tables, columns) -> dict:
+    """
+    Busca en una sola consulta qué columnas existen.
+
+    Devuelve {(tabla, columna): is_nullable} sólo para las columnas pedidas,
+    en lugar de traer el esquema completo de cada tabla.
+    """
+    result = await conn.execute(
+        text("""
+            SELECT table_name, column_name, is_nullable FROM information_schema.columns
+            WHERE table_name = ANY(:tables) AND column_name = ANY(:columns)
+        """),
+        {"tables": list(tables), "columns": list(columns)}
+    )
+    return {(row[0], row[1]): row[2] == "YES" for row in result.fetchall()}
+
+
 async def ensure_photo_guard_columns():
     """
     Asegura que las columnas de Photo Guard existan en la base de datos.
 
     Esta función usa ALTER TABLE ... ADD COLUMN IF NOT EXISTS para agregar
-    las columnas necesarias sin depender de Alembic.
+    las columnas necesarias sin depender de Alembic. Una vez aplicadas se
+    registra la versión en schema_fixups y los siguientes arranques sólo
+    hacen un SELECT.
     """
-    columns_sql = [
-        # Contacts - Photo Guard location tracking
-        "ALTER TABLE contacts ADD COLUMN IF NOT EXISTS last_known_latitude DOUBLE PRECISION",
-        "ALTER TABLE contacts ADD COLUMN IF NOT EXISTS last_known_longitude DOUBLE PRECISION",
-        "ALTER TABLE contacts ADD COLUMN IF NOT EXISTS last_location_at TIMESTAMP",
-        "ALTER TABLE contacts ADD COLUMN IF NOT EXISTS last_location_accuracy DOUBLE PRECISION",
-
-        # Compliance Records - Photo Guard validation
-        "ALTER TABLE compliance_records ADD COLUMN IF NOT EXISTS expected_latitude DOUBLE PRECISION",
-        "ALTER TABLE compliance_records ADD COLUMN IF NOT EXISTS expected_longitude DOUBLE PRECISION",
-        "ALTER TABLE compliance_records ADD COLUMN IF NOT EXISTS authenticity_score INTEGER",
-        "ALTER TABLE compliance_records ADD COLUMN IF NOT EXISTS location_verified BOOLEAN",
-        "ALTER TABLE compliance_records ADD COLUMN IF NOT EXISTS time_verified BOOLEAN",
-        "ALTER TABLE compliance_records ADD COLUMN IF NOT EXISTS distance_from_expected DOUBLE PRECISION",
-        "ALTER TABLE compliance_records ADD COLUMN IF NOT EXISTS time_diff_minutes INTEGER",
-        "ALTER TABLE compliance_records ADD COLUMN IF NOT EXISTS ai_appears_screenshot BOOLEAN",
-
-        # Fix: Allow photos without pending reminder (location_id can be null)
-        "ALTER TABLE compliance_records ALTER COLUMN location_id DROP NOT NULL",
-    ]
-
-    logger.info("=== INICIANDO VERIFICACIÓN DE COLUMNAS PHOTO GUARD ===")
+    global _PHOTO_GUARD_READY
+    if _PHOTO_GUARD_READY:
+        return True
 
     try:
         async with async_engine.begin() as conn:
-            # Primero verificar qué columnas existen
-            result = await conn.execute(text("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_name = 'contacts'
-            """))
-            existing_contacts_cols = [row[0] for row in result.fetchall()]
-            logger.info(f"Columnas existentes en contacts: {existing_contacts_cols}")
+            await conn.execute(text(SCHEMA_FIXUPS_TABLE_SQL))
 
-            result = await conn.execute(text("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_name = 'compliance_records'
-            """))
-            existing_compliance_cols = [row[0] for row in result.fetchall()]
-            logger.info(f"Columnas existentes en compliance_records: {existing_compliance_cols}")
+            # Camino rápido: si el fixup ya se aplicó no hay nada que revisar
+            result = await conn.execute(
+                text("SELECT 1 FROM schema_fixups WHERE version = :version"),
+                {"version": PHOTO_GUARD_FIXUP_VERSION}
+            )
+            if result.scalar() is not None:
+                _PHOTO_GUARD_READY = True
+                logger.info("Photo Guard columns already applied")
+                return True
 
-            # Ahora agregar las columnas faltantes
-            for sql in columns_sql:
-                try:
-                    logger.info(f"Ejecutando: {sql}")
-                    await conn.execute(text(sql))
-                    logger.info(f"  ✓ OK")
-                except Exception as col_error:
-                    logger.warning(f"  ⚠ {col_error}")
+        logger.info("=== INICIANDO VERIFICACIÓN DE COLUMNAS PHOTO GUARD ===")
 
-            logger.info("=== PHOTO GUARD COLUMNS VERIFIED/CREATED SUCCESSFULLY ===")
-            return True
+        # Todo el fixup (verificación, ALTERs y registro) en un solo round-trip
+        async with async_engine.begin() as conn:
+            await conn.execute(text(PHOTO_GUARD_FIXUP_SQL))
+
+        _PHOTO_GUARD_READY = True
+        logger.info("=== PHOTO GUARD COLUMNS VERIFIED/CREATED SUCCESSFULLY ===")
+        return True
     except Exception as e:
         logger.error(f"!!! ERROR ensuring Photo Guard columns: {type(e).__name__}: {e}", exc_info=True)
         return False
@@ -172,8 +301,8 @@ async def ensure_product_orders_table():
                     rejection_reason TEXT,
                     admin_notes TEXT,
                     telegram_user_id VARCHAR(50),
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    updated_at TIMESTAMP DEFAULT NOW()
+                    created_at TIMESTAMP DEFAULT timezone('utc', now()),
+                    updated_at TIMESTAMP DEFAULT timezone('utc', now())
                 )
             """))
 
@@ -191,26 +320,67 @@ async def ensure_product_orders_table():
         return False
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Maneja el ciclo de vida de la aplicación."""
-    telegram_app = None
+# Ventana en la que un error del webhook se considera del deploy anterior
+BOT_CONFLICT_WINDOW_SECONDS = 60
+BOT_CONFLICT_WAIT_SECONDS = 10
 
+
+async def wait_for_previous_bot():
+    """
+    Espera antes de iniciar el bot sólo si hace falta.
+
+    Antes se esperaban siempre 10 segundos. Ahora se consulta getWebhookInfo
+    y sólo se espera si Telegram reporta un error reciente en el webhook
+    (señal de que la instancia anterior sigue activa).
+    """
     try:
-        # Startup
-        logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-        logger.info(f"Environment: {settings.ENVIRONMENT}")
+        info = await get_webhook_info()
+    except Exception as e:
+        logger.warning(f"Could not query webhook info before starting bot: {e}")
+        return
+
+    last_error_date = (info or {}).get("last_error_date")
+    if last_error_date and time.time() - last_error_date < BOT_CONFLICT_WINDOW_SECONDS:
+        logger.info(
+            f"Recent webhook error ({info.get('last_error_message')}), "
+            f"waiting {BOT_CONFLICT_WAIT_SECONDS} seconds before starting bot..."
+        )
+        await asyncio.sleep(BOT_CONFLICT_WAIT_SECONDS)
+
+
+# Estado del arranque (migraciones, bot, scheduler): pending | ready | failed
+_startup_state = "pending"
+
 
+async def ensure_schema_fixups():
+    """Aplica los ajustes de esquema que no dependen de Alembic."""
+    # IMPORTANTE: Asegurar que las columnas de Photo Guard existan
+    # Esto es necesario porque create_all no agrega columnas a tablas existentes
+    await ensure_photo_guard_columns()
+
+    # Asegurar que la tabla product_orders exista
+    await ensure_product_orders_table()
+
+    # Asegurar que self_evaluations tenga todas las columnas
+    await ensure_self_evaluations_columns()
+
+
+async def run_startup():
+    """
+    Ejecuta las tareas de arranque: migraciones, columnas, bot y scheduler.
+
+    Con MIGRATION_MODE="async" corre en segundo plano para que lifespan ceda
+    el control de inmediato y /health responda mientras tanto.
+    """
+    global _startup_state
+
+    try:
         # Ejecutar migraciones de base de datos
         # Esto crea tablas nuevas Y agrega columnas a tablas existentes
         try:
-            # Importar modelos para que Alembic los conozca
-            from app.models import (
-                Client, Location, Contact, Product,
-                ScheduledReminder, ComplianceRecord, NotificationLog,
-                EvaluationTemplate, SelfEvaluation
-            )
-            run_migrations()
+            # Alembic es síncrono: en un hilo para no bloquear el event loop.
+            # alembic/env.py importa los modelos que necesita.
+            await asyncio.to_thread(run_migrations)
         except Exception as e:
             logger.error(f"Database migration error: {e}")
             # Fallback: intentar create_all básico
@@ -221,28 +391,23 @@ async def lifespan(app: FastAPI):
             except Exception as e2:
                 logger.error(f"Fallback database initialization also failed: {e2}")
 
-        # IMPORTANTE: Asegurar que las columnas de Photo Guard existan
-        # Esto es necesario porque create_all no agrega columnas a tablas existentes
-        await ensure_photo_guard_columns()
-
-        # Asegurar que la tabla product_orders exista
-        await ensure_product_orders_table()
-
-        # Asegurar que self_evaluations tenga todas las columnas
-        await ensure_self_evaluations_columns()
+        # Los fixups de esquema y la espera previa al bot (llamada a Telegram y,
+        # si hay conflicto, unos segundos de pausa) corren en paralelo
+        await asyncio.gather(
+            ensure_schema_fixups(),
+            wait_for_previous_bot() if settings.TELEGRAM_BOT_TOKEN else asyncio.sleep(0)
+        )
 
-        # Iniciar bot de Telegram con delay para evitar conflictos
+        # Iniciar bot de Telegram una vez que el esquema está completo: los
+        # handlers y el scheduler leen las columnas de Photo Guard
         if settings.TELEGRAM_BOT_TOKEN:
             try:
-                import asyncio
-                from app.bot.handlers import start_bot, stop_bot
-                from app.bot.scheduler import start_scheduler, stop_scheduler
-
-                # Esperar 10 segundos para asegurar que cualquier instancia anterior haya terminado
-                logger.info("Waiting 10 seconds before starting bot to avoid conflicts...")
-                await asyncio.sleep(10)
+                from app.bot.handlers import start_bot
+                from app.bot.scheduler import start_scheduler
 
                 telegram_app = await start_bot()
+                # El webhook acaba de cambiar: descartar la info cacheada
+                invalidate_webhook_info()
                 if telegram_app:
                     # Guardar referencia global para el webhook
                     set_telegram_app(telegram_app)
@@ -254,27 +419,75 @@ async def lifespan(app: FastAPI):
                 logger.error(f"Failed to start Telegram bot: {e}", exc_info=True)
                 # Continue anyway - API should still work
 
-        logger.info("Application startup complete - ready to serve requests")
+        _startup_state = "ready"
+        logger.info("Application startup complete")
 
+    except asyncio.CancelledError:
+        logger.warning("Startup cancelled")
+        raise
     except Exception as e:
-        logger.error(f"Critical startup error: {e}")
+        _startup_state = "failed"
+        logger.error(f"Critical startup error: {e}", exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Maneja el ciclo de vida de la aplicación."""
+    global _httpx
+
+    # Startup
+    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    logger.info(f"Environment: {settings.ENVIRONMENT}")
+
+    _httpx = httpx.AsyncClient(
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=10)
+    )
+
+    start_update_workers()
+
+    startup_task = None
+    if settings.MIGRATION_MODE == "sync":
+        await run_startup()
+    else:
+        startup_task = asyncio.create_task(run_startup())
+        logger.info("Startup running in background - /health available")
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
 
-    # Detener bot y scheduler
-    if telegram_app:
+    if startup_task and not startup_task.done():
+        startup_task.cancel()
         try:
-            from app.bot.handlers import stop_bot
+            await startup_task
+        except asyncio.CancelledError:
+            pass
+
+    # Terminar los updates encolados antes de detener el bot
+    await stop_update_workers()
+
+    # Detener bot, scheduler, cliente HTTP y engine en paralelo. El scheduler
+    # va antes del engine: al detenerse vacía la cola de NotificationLog
+    async def stop_scheduler_and_engine():
+        if _telegram_app:
             from app.bot.scheduler import stop_scheduler
-            stop_scheduler()
-            await stop_bot(telegram_app)
-        except Exception as e:
-            logger.error(f"Error stopping bot: {e}")
+            await stop_scheduler()
+        await async_engine.dispose()
+
+    shutdown_steps = {
+        "scheduler/engine": stop_scheduler_and_engine(),
+        "http client": _httpx.aclose(),
+    }
+    if _telegram_app:
+        from app.bot.handlers import stop_bot
+        shutdown_steps["bot"] = stop_bot(_telegram_app)
 
-    await async_engine.dispose()
+    results = await asyncio.gather(*shutdown_steps.values(), return_exceptions=True)
+    for name, result in zip(shutdown_steps, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error stopping {name}: {result}")
 
 
 # Crear aplicación FastAPI
@@ -284,18 +497,20 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url="/docs",  # Swagger UI habilitado
     redoc_url="/redoc",  # ReDoc habilitado
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
 # Configurar CORS
 # Orígenes permitidos (hardcoded para evitar problemas con variables de entorno)
-cors_origins = [
+# También agregar orígenes de la variable de entorno si existen
+# (dict.fromkeys conserva el orden y quita duplicados)
+cors_origins = tuple(dict.fromkeys((
     "http://localhost:3000",
     "http://localhost:5173",
     "https://biorem-compliance-front-end-production.up.railway.app",
-]
-# También agregar orígenes de la variable de entorno si existen
-cors_origins.extend([o for o in settings.cors_origins_list if o not in cors_origins])
+    *settings.cors_origins,
+)))
 
 app.add_middleware(
     CORSMiddleware,
@@ -307,17 +522,76 @@ app.add_middleware(
 
 
 # Health check endpoint - MUST respond quickly for Railway
+# Respuesta pre-serializada: sin encoder ni validación en cada probe
+_HEALTH_OK = Response(content=b'{"status":"ok"}', media_type="application/json")
+
+
 @app.get("/health")
-def health_check():
-    """Endpoint de salud para Railway y monitoreo."""
-    return {"status": "ok"}
+@app.get("/health/live")
+async def health_check():
+    """Liveness: el proceso responde (Railway apunta aquí)."""
+    return _HEALTH_OK
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: 503 hasta que terminan migraciones, fixups y bot."""
+    if _startup_state != "ready":
+        return JSONResponse({"status": _startup_state}, status_code=503)
+    return _HEALTH_OK
+
+
+# URL del webhook configurada (settings es inmutable, se resuelve una vez)
+_WEBHOOK_URL = settings.TELEGRAM_WEBHOOK_URL or None
+
+# Cliente HTTP compartido (se crea en lifespan) y caché de getWebhookInfo
+_httpx: Optional[httpx.AsyncClient] = None
+WEBHOOK_INFO_TTL_SECONDS = 30
+_webhook_info_cache: Optional[tuple] = None  # (expira_en, info)
+
+
+def invalidate_webhook_info():
+    """Descarta el getWebhookInfo cacheado (p. ej. tras setWebhook)."""
+    global _webhook_info_cache
+    _webhook_info_cache = None
+
+
+async def get_webhook_info() -> Optional[dict]:
+    """Consulta getWebhookInfo a Telegram, cacheado unos segundos."""
+    global _webhook_info_cache
+
+    now = time.monotonic()
+    if _webhook_info_cache and _webhook_info_cache[0] > now:
+        return _webhook_info_cache[1]
+
+    client = _httpx or httpx.AsyncClient(timeout=5)
+    try:
+        response = await client.get(
+            f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/getWebhookInfo"
+        )
+    finally:
+        if client is not _httpx:
+            await client.aclose()
+
+    webhook_info = response.json()
+    info = None
+    if webhook_info.get("ok"):
+        result = webhook_info.get("result", {})
+        info = {
+            "url": result.get("url", ""),
+            "has_custom_certificate": result.get("has_custom_certificate", False),
+            "pending_update_count": result.get("pending_update_count", 0),
+            "last_error_date": result.get("last_error_date"),
+            "last_error_message": result.get("last_error_message"),
+        }
+
+    _webhook_info_cache = (now + WEBHOOK_INFO_TTL_SECONDS, info)
+    return info
 
 
 @app.get("/health/detailed")
 async def health_check_detailed():
     """Endpoint de salud detallado con diagnóstico de DB y Bot."""
-    import httpx
-
     status = {
         "status": "healthy",
         "app": settings.APP_NAME,
@@ -325,8 +599,11 @@ async def health_check_detailed():
         "environment": settings.ENVIRONMENT,
         "database": "unknown",
         "bot": "unknown",
+        "startup": _startup_state,
+        "db_pool": async_engine.pool.status(),
+        "webhook_queue_size": _update_queue.qsize() if _update_queue is not None else None,
         "bot_app_initialized": _telegram_app is not None,
-        "webhook_url_configured": settings.TELEGRAM_WEBHOOK_URL if hasattr(settings, 'TELEGRAM_WEBHOOK_URL') and settings.TELEGRAM_WEBHOOK_URL else None,
+        "webhook_url_configured": _WEBHOOK_URL,
         "telegram_webhook_info": None,
         "photo_guard_columns": []
     }
@@ -334,15 +611,15 @@ async def health_check_detailed():
     # Verificar base de datos y columnas
     try:
         async with async_engine.connect() as conn:
-            await conn.execute(text("SELECT 1"))
+            # La misma consulta sirve como prueba de conexión
+            existing = await get_existing_columns(
+                conn,
+                ["contacts"],
+                ["last_known_latitude", "last_known_longitude", "last_location_at"]
+            )
             status["database"] = "connected"
 
-            result = await conn.execute(text("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_name = 'contacts'
-                AND column_name IN ('last_known_latitude', 'last_known_longitude', 'last_location_at')
-            """))
-            cols = [row[0] for row in result.fetchall()]
+            cols = [col for _, col in existing]
             status["photo_guard_columns"] = cols
             status["photo_guard"] = "OK" if len(cols) >= 3 else f"MISSING - only {len(cols)}/3"
 
@@ -356,21 +633,14 @@ async def health_check_detailed():
 
         # Consultar a Telegram el estado del webhook
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/getWebhookInfo",
-                    timeout=5
-                )
-                webhook_info = response.json()
-                if webhook_info.get("ok"):
-                    info = webhook_info.get("result", {})
-                    status["telegram_webhook_info"] = {
-                        "url": info.get("url", ""),
-                        "has_custom_certificate": info.get("has_custom_certificate", False),
-                        "pending_update_count": info.get("pending_update_count", 0),
-                        "last_error_date": info.get("last_error_date"),
-                        "last_error_message": info.get("last_error_message"),
-                    }
+            webhook_info = await get_webhook_info()
+            status["telegram_webhook_info"] = webhook_info
+            # Para que los scripts de deploy verifiquen el webhook registrado
+            status["webhook_url_registered"] = bool(
+                webhook_info
+                and status["webhook_url_configured"]
+                and webhook_info.get("url") == status["webhook_url_configured"]
+            )
         except Exception as e:
             status["telegram_webhook_info"] = f"error: {str(e)}"
     else:
@@ -380,66 +650,146 @@ async def health_check_detailed():
 
 
 # Root endpoint
-@app.get("/")
-async def root():
-    """Endpoint raíz."""
-    return {
+# Sólo depende de settings (inmutable): se serializa una vez al importar
+_ROOT_RESPONSE = Response(
+    content=orjson.dumps({
         "message": f"Bienvenido a {settings.APP_NAME}",
         "version": settings.APP_VERSION,
         "docs": "/docs" if settings.DEBUG else "Disabled in production"
-    }
+    }),
+    media_type="application/json"
+)
+
+
+@app.get("/")
+async def root():
+    """Endpoint raíz."""
+    return _ROOT_RESPONSE
 
 
 # Variable global para almacenar la aplicación del bot
 _telegram_app = None
+_bot = None
+# telegram.Update; se importa al iniciar el bot, así el SDK de Telegram no se
+# carga si TELEGRAM_BOT_TOKEN no está configurado
+_Update = None
 
 
 def set_telegram_app(app):
-    """Guarda la referencia a la aplicación de Telegram."""
-    global _telegram_app
+    """Guarda la referencia a la aplicación de Telegram (y a su bot)."""
+    global _telegram_app, _bot, _Update
+    from telegram import Update
+
     _telegram_app = app
+    _bot = app.bot
+    _Update = Update
 
 
 # Webhook endpoint para Telegram
 from fastapi import Request
 
+# Tamaño máximo aceptado para un update de Telegram
+WEBHOOK_MAX_BODY_BYTES = 1024 * 1024
+
+# Cola de updates: el webhook sólo encola y un grupo fijo de workers los
+# procesa (la cola y los workers se crean en lifespan)
+_update_queue: Optional[asyncio.Queue] = None
+_update_workers: list = []
+UPDATE_QUEUE_DRAIN_SECONDS = 10
+
+
+async def _update_worker(queue: asyncio.Queue):
+    """Procesa updates de la cola hasta que se cancela."""
+    while True:
+        update = await queue.get()
+        try:
+            await _telegram_app.process_update(update)
+            logger.debug("Update %s processed successfully", update.update_id)
+        except Exception as e:
+            logger.error(f"!!! WEBHOOK ERROR: {type(e).__name__}: {e}", exc_info=True)
+        finally:
+            queue.task_done()
+
+
+def start_update_workers():
+    """Crea la cola de updates y sus workers."""
+    global _update_queue
+    _update_queue = asyncio.Queue(maxsize=settings.WEBHOOK_QUEUE_SIZE)
+    _update_workers.extend(
+        asyncio.create_task(_update_worker(_update_queue))
+        for _ in range(settings.WEBHOOK_WORKERS)
+    )
+
+
+async def stop_update_workers():
+    """Espera (con tope) a que se vacíe la cola y detiene los workers."""
+    if _update_queue is not None and _telegram_app:
+        try:
+            await asyncio.wait_for(_update_queue.join(), timeout=UPDATE_QUEUE_DRAIN_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"{_update_queue.qsize()} updates left unprocessed on shutdown")
+
+    for worker in _update_workers:
+        worker.cancel()
+    await asyncio.gather(*_update_workers, return_exceptions=True)
+    _update_workers.clear()
+
+
 @app.post("/webhook/telegram")
 async def telegram_webhook(request: Request):
     """Recibe updates de Telegram via webhook."""
-    global _telegram_app
-
     if not _telegram_app:
         logger.warning("Webhook received but bot not initialized")
         return {"ok": False, "error": "Bot not initialized"}
 
-    try:
-        # Parsear el update de Telegram
-        data = await request.json()
+    # Verificar el secret_token antes de leer el body
+    if settings.TELEGRAM_WEBHOOK_SECRET and not hmac.compare_digest(
+        request.headers.get("x-telegram-bot-api-secret-token", "").encode(),
+        settings.TELEGRAM_WEBHOOK_SECRET.encode()
+    ):
+        logger.warning("Webhook rejected: invalid secret token")
+        return Response(status_code=401)
 
-        # Log detallado del tipo de update
-        update_id = data.get('update_id', 'unknown')
-        message = data.get('message', {})
-        has_location = 'location' in message
-        has_photo = 'photo' in message
-        has_text = 'text' in message
-        text_content = message.get('text', '')[:50] if has_text else None
+    # Content-Length malformado: rechazar en lugar de caer en el except genérico
+    try:
+        content_length = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        return Response(status_code=400)
 
-        logger.info(f"=== WEBHOOK UPDATE {update_id} ===")
-        logger.info(f"  has_location: {has_location}")
-        logger.info(f"  has_photo: {has_photo}")
-        logger.info(f"  has_text: {has_text} -> {text_content}")
+    try:
+        # Leer el body con tope de tamaño (Content-Length puede faltar o mentir)
+        if content_length > WEBHOOK_MAX_BODY_BYTES:
+            return Response(status_code=413)
+        body = bytearray()
+        async for chunk in request.stream():
+            body.extend(chunk)
+            if len(body) > WEBHOOK_MAX_BODY_BYTES:
+                return Response(status_code=413)
 
-        if has_location:
-            loc = message.get('location', {})
-            logger.info(f"  LOCATION: lat={loc.get('latitude')}, lon={loc.get('longitude')}")
+        # Parsear el update de Telegram
+        data = orjson.loads(body)
+        update_id = data.get('update_id', 'unknown')
 
-        # Procesar el update
-        from telegram import Update
-        update = Update.de_json(data, _telegram_app.bot)
+        # Resumen del tipo de update (sólo se arma si el nivel INFO está activo)
+        if logger.isEnabledFor(logging.INFO):
+            message = data.get('message', {})
+            loc = message.get('location')
+            logger.info(
+                "Webhook update %s: location=%s photo=%s text=%s",
+                update_id,
+                f"{loc.get('latitude')},{loc.get('longitude')}" if loc else None,
+                'photo' in message,
+                message.get('text', '')[:50] if 'text' in message else None
+            )
 
-        logger.info(f"  Processing update with bot application...")
-        await _telegram_app.process_update(update)
-        logger.info(f"  Update {update_id} processed successfully!")
+        # Encolar y responder de inmediato; los workers lo procesan
+        update = _Update.de_json(data, _bot)
+        try:
+            _update_queue.put_nowait(update)
+        except asyncio.QueueFull:
+            # Saturado: 503 para que Telegram reintente más tarde
+            logger.warning(f"Webhook queue full ({_update_queue.qsize()}), rejecting update {update_id}")
+            return JSONResponse({"ok": False, "error": "Overloaded"}, status_code=503)
 
         return {"ok": True}
 
@@ -449,25 +799,26 @@ async def telegram_webhook(request: Request):
         return {"ok": True}
 
 
-# Incluir routers de API
-from app.api import (
-    clients_router,
-    locations_router,
-    products_router,
-    contacts_router,
-    compliance_router,
-    reports_router,
-    webapp_router,
-    evaluations_router,
-    orders_router
-)
+# Routers de API: (módulo, prefijo, tag)
+API_ROUTERS = [
+    ("app.api.clients", "/api/clients", "Clientes"),
+    ("app.api.locations", "/api/locations", "Ubicaciones"),
+    ("app.api.products", "/api/products", "Productos"),
+    ("app.api.contacts", "/api/contacts", "Contactos"),
+    ("app.api.compliance", "/api/compliance", "Compliance"),
+    ("app.api.reports", "/api/reports", "Reportes"),
+    ("app.api.webapp", "/api/webapp", "WebApp"),
+    ("app.api.evaluations", "/api/evaluations", "Evaluaciones"),
+    ("app.api.orders", "/api/orders", "Pedidos"),
+]
 
-app.include_router(clients_router, prefix="/api/clients", tags=["Clientes"])
-app.include_router(locations_router, prefix="/api/locations", tags=["Ubicaciones"])
-app.include_router(products_router, prefix="/api/products", tags=["Productos"])
-app.include_router(contacts_router, prefix="/api/contacts", tags=["Contactos"])
-app.include_router(compliance_router, prefix="/api/compliance", tags=["Compliance"])
-app.include_router(reports_router, prefix="/api/reports", tags=["Reportes"])
-app.include_router(webapp_router, prefix="/api/webapp", tags=["WebApp"])
-app.include_router(evaluations_router, prefix="/api/evaluations", tags=["Evaluaciones"])
-app.include_router(orders_router, prefix="/api/orders", tags=["Pedidos"])
+
+def register_routers(app: FastAPI):
+    """Importa cada módulo de la API por separado e incluye su router."""
+    for module_name, prefix, tag in API_ROUTERS:
+        module = importlib.import_module(module_name)
+        app.include_router(module.router, prefix=prefix, tags=[tag])
+
+
+# Incluir routers de API
+register_routers(app)
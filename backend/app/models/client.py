@@ -1,9 +1,8 @@
 from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Enum
 from sqlalchemy.orm import relationship
-from datetime import datetime
 import enum
 
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class BusinessType(str, enum.Enum):
@@ -24,6 +23,7 @@ class Client(Base):
     Cada cliente puede tener múltiples ubicaciones (sucursales) y contactos.
     """
     __tablename__ = "clients"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -53,8 +53,8 @@ class Client(Base):
     notes = Column(String(1000))
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     active = Column(Boolean, default=True, index=True)
 
     # Relaciones
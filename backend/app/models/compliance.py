@@ -1,9 +1,51 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 
-from app.database import Base
+from app.database import Base, utcnow_sql
+
+
+# Tablas de puntaje de autenticidad (Photo Guard)
+# Distancia: <=100 m muy cerca (40), <=300 m cerca (30), <=500 m aceptable (20)
+_DISTANCE_THRESHOLDS_M = (100, 300, 500)
+_DISTANCE_POINTS = (40, 30, 20, 0)
+# Tiempo: <=30 min muy reciente (30), <=120 min reciente (20), <=240 min aceptable (10)
+_TIME_THRESHOLDS_MIN = (30, 120, 240)
+_TIME_POINTS = (30, 20, 10, 0)
+# Confianza IA: >=0.4 (10), >=0.6 (20), >=0.8 (30)
+_CONFIDENCE_THRESHOLDS = (0.4, 0.6, 0.8)
+_CONFIDENCE_POINTS = (0, 10, 20, 30)
+
+
+def _ai_validation_field(key: str, type_=None, default=None, default_factory=None):
+    """
+    Campo derivado del JSONB ai_validation.
+
+    En Python lee la clave del dict (None si no hay validación); en SQL usa
+    el operador ->> con cast, para poder filtrar por él. Para defaults
+    mutables usar default_factory, así cada registro recibe su propia copia.
+    Al asignarlo se reemplaza ai_validation por un dict nuevo con la clave
+    actualizada (reasignar el JSONB es lo que lo marca como modificado).
+    """
+    def getter(self):
+        if self.ai_validation is None:
+            return None
+        if key not in self.ai_validation:
+            return default_factory() if default_factory else default
+        return self.ai_validation[key]
+
+    def setter(self, value):
+        self.ai_validation = {**(self.ai_validation or {}), key: value}
+
+    def expression(cls):
+        if type_ is None:
+            return cls.ai_validation[key]
+        return cls.ai_validation[key].astext.cast(type_)
+
+    return hybrid_property(getter, setter, expr=expression)
 
 
 class ComplianceRecord(Base):
@@ -14,6 +56,16 @@ class ComplianceRecord(Base):
     Incluye la foto, validación de IA y validación manual si aplica.
     """
     __tablename__ = "compliance_records"
+    __table_args__ = (
+        # Historial por ubicación (más recientes primero) y reportes por rango
+        Index("ix_compliance_records_location_created", "location_id", text("created_at DESC")),
+        # Cola de moderación: registros sin validación final
+        Index(
+            "ix_compliance_records_pending", "created_at",
+            postgresql_where=text("is_valid IS NULL")
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -58,13 +110,13 @@ class ComplianceRecord(Base):
     ai_validated_at = Column(DateTime, nullable=True)
     ai_processing_time_ms = Column(Integer, nullable=True)
 
-    # Campos específicos de validación IA
-    ai_product_detected = Column(Boolean, nullable=True)
-    ai_drainage_visible = Column(Boolean, nullable=True)
-    ai_appears_recent = Column(Boolean, nullable=True)
-    ai_appears_screenshot = Column(Boolean, nullable=True)  # Detecta foto de pantalla
-    ai_issues = Column(JSONB, nullable=True)  # Lista de problemas detectados
-    ai_summary = Column(Text, nullable=True)
+    # Campos específicos de validación IA (leídos de ai_validation)
+    ai_product_detected = _ai_validation_field("product_detected", Boolean)
+    ai_drainage_visible = _ai_validation_field("drainage_area_visible", Boolean)
+    ai_appears_recent = _ai_validation_field("appears_recent", Boolean)
+    ai_appears_screenshot = _ai_validation_field("appears_screenshot", Boolean, False)  # Detecta foto de pantalla
+    ai_issues = _ai_validation_field("issues", default_factory=list)  # Lista de problemas detectados
+    ai_summary = _ai_validation_field("summary", Text)
 
     # Validación manual (por admin)
     manual_validated = Column(Boolean, nullable=True)
@@ -79,8 +131,8 @@ class ComplianceRecord(Base):
     contact_notes = Column(Text, nullable=True)  # Notas que envió el usuario
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
 
     # Relaciones
     location = relationship("Location", back_populates="compliance_records")
@@ -92,15 +144,12 @@ class ComplianceRecord(Base):
 
     def set_ai_validation(self, validation_result: dict, processing_time_ms: int = None):
         """Establece el resultado de validación de IA."""
-        self.ai_validation = validation_result
+        # Sólo reasignar el JSONB si cambió, para no marcarlo como modificado
+        if self.ai_validation != validation_result:
+            self.ai_validation = validation_result
+
         self.ai_validated = validation_result.get("is_valid", False)
         self.ai_confidence = validation_result.get("confidence", 0.0)
-        self.ai_product_detected = validation_result.get("product_detected")
-        self.ai_drainage_visible = validation_result.get("drainage_area_visible")
-        self.ai_appears_recent = validation_result.get("appears_recent")
-        self.ai_appears_screenshot = validation_result.get("appears_screenshot", False)
-        self.ai_issues = validation_result.get("issues", [])
-        self.ai_summary = validation_result.get("summary")
         self.ai_validated_at = datetime.utcnow()
         if processing_time_ms:
             self.ai_processing_time_ms = processing_time_ms
@@ -126,17 +175,9 @@ class ComplianceRecord(Base):
         # Factor 1: Geolocalización (40 puntos)
         if self.photo_latitude and self.photo_longitude:
             if self.distance_from_expected is not None:
-                if self.distance_from_expected <= 100:
-                    score += 40  # Muy cerca
-                    self.location_verified = True
-                elif self.distance_from_expected <= 300:
-                    score += 30  # Cerca
-                    self.location_verified = True
-                elif self.distance_from_expected <= 500:
-                    score += 20  # Aceptable
-                    self.location_verified = True
-                else:
-                    self.location_verified = False
+                points = _DISTANCE_POINTS[bisect_left(_DISTANCE_THRESHOLDS_M, self.distance_from_expected)]
+                score += points
+                self.location_verified = points > 0
             else:
                 # Sin ubicación esperada, dar puntos parciales por compartir ubicación
                 score += 15
@@ -146,18 +187,9 @@ class ComplianceRecord(Base):
 
         # Factor 2: Ventana de tiempo (30 puntos)
         if self.time_diff_minutes is not None:
-            abs_diff = abs(self.time_diff_minutes)
-            if abs_diff <= 30:
-                score += 30  # Muy reciente
-                self.time_verified = True
-            elif abs_diff <= 120:
-                score += 20  # Reciente
-                self.time_verified = True
-            elif abs_diff <= 240:
-                score += 10  # Aceptable
-                self.time_verified = True
-            else:
-                self.time_verified = False
+            points = _TIME_POINTS[bisect_left(_TIME_THRESHOLDS_MIN, abs(self.time_diff_minutes))]
+            score += points
+            self.time_verified = points > 0
         else:
             # Sin recordatorio asociado, dar puntos base
             score += 15
@@ -165,12 +197,7 @@ class ComplianceRecord(Base):
 
         # Factor 3: Validación IA (30 puntos)
         if self.ai_confidence is not None:
-            if self.ai_confidence >= 0.8:
-                score += 30
-            elif self.ai_confidence >= 0.6:
-                score += 20
-            elif self.ai_confidence >= 0.4:
-                score += 10
+            score += _CONFIDENCE_POINTS[bisect_right(_CONFIDENCE_THRESHOLDS, self.ai_confidence)]
 
         # Penalización por screenshot detectado
         if self.ai_appears_screenshot:
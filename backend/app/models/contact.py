@@ -1,10 +1,11 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Float, Index
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
+import base64
 import enum
 import secrets
 
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class ContactRole(str, enum.Enum):
@@ -22,6 +23,11 @@ class Contact(Base):
     Los contactos reciben recordatorios por Telegram y envían fotos de evidencia.
     """
     __tablename__ = "contacts"
+    __table_args__ = (
+        # Búsqueda de supervisores/admins de un cliente (escalamientos, pedidos)
+        Index("ix_contacts_client_role", "client_id", "role"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -57,8 +63,8 @@ class Contact(Base):
     quiet_hours_end = Column(String(5), nullable=True)  # HH:MM
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     active = Column(Boolean, default=True, index=True)
 
     # Relaciones
@@ -88,10 +94,29 @@ class Contact(Base):
     def __repr__(self):
         return f"<Contact(id={self.id}, name='{self.name}', telegram_id={self.telegram_id})>"
 
+    @validates("invite_code")
+    def _normalize_invite_code(self, key, value):
+        """Guarda el código de invitación siempre en mayúsculas."""
+        return value.upper() if value else value
+
+    @staticmethod
+    def generate_invite_codes(n: int) -> list[str]:
+        """
+        Genera n códigos de invitación de 8 caracteres.
+
+        Lee los bytes aleatorios de una sola vez (útil al dar de alta
+        contactos en lote) y codifica 6 bytes por código.
+        """
+        buf = secrets.token_bytes(6 * n)
+        return [
+            base64.urlsafe_b64encode(buf[i:i + 6]).decode().upper()
+            for i in range(0, 6 * n, 6)
+        ]
+
     @staticmethod
     def generate_invite_code() -> str:
         """Genera un código de invitación único de 8 caracteres."""
-        return secrets.token_urlsafe(6)[:8].upper()
+        return Contact.generate_invite_codes(1)[0]
 
     def is_linked(self) -> bool:
         """Verifica si el contacto tiene Telegram vinculado."""
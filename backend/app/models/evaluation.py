@@ -4,12 +4,11 @@ Modelos de Autoevaluación para Biorem Compliance.
 Permite crear plantillas de evaluación configurables y registrar
 evaluaciones completadas con fotos, scores y firma digital.
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy.orm import relationship, deferred, reconstructor, validates
 
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class EvaluationTemplate(Base):
@@ -20,6 +19,7 @@ class EvaluationTemplate(Base):
     junto con sus pesos para el cálculo del score.
     """
     __tablename__ = "evaluation_templates"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -54,12 +54,45 @@ class EvaluationTemplate(Base):
     active = Column(Boolean, default=True)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
 
     # Relaciones
     evaluations = relationship("SelfEvaluation", back_populates="template")
 
+    def __init__(self, **kwargs):
+        self._compiled = None
+        super().__init__(**kwargs)
+
+    @reconstructor
+    def _init_on_load(self):
+        self._compiled = None
+
+    @validates("areas")
+    def _reset_compiled(self, key, value):
+        # Al reemplazar las áreas hay que volver a compilar
+        self._compiled = None
+        return value
+
+    @property
+    def compiled(self) -> tuple:
+        """
+        Áreas aplanadas a tuplas para calcular scores, compiladas una vez.
+
+        ((area_id, area_weight, ((q_id, q_weight), ...)), ...), con los pesos
+        por defecto ya resueltos.
+        """
+        if self._compiled is None:
+            self._compiled = tuple(
+                (
+                    area["id"],
+                    area.get("weight", 1.0),
+                    tuple((q["id"], q.get("weight", 1.0)) for q in area.get("questions", []))
+                )
+                for area in (self.areas or {}).get("areas", [])
+            )
+        return self._compiled
+
     def __repr__(self):
         return f"<EvaluationTemplate(id={self.id}, name='{self.name}')>"
 
@@ -72,6 +105,11 @@ class SelfEvaluation(Base):
     evaluación realizada por un contacto.
     """
     __tablename__ = "self_evaluations"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Historial por ubicación (list_evaluations: location_id = X ORDER BY created_at DESC)
+        Index("ix_self_evaluations_location_created", "location_id", text("created_at DESC")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -96,10 +134,11 @@ class SelfEvaluation(Base):
     passed = Column(Boolean, nullable=False)
 
     # Fotos de evidencia (URLs o base64 references)
-    photos = Column(JSONB)  # [{"question_id": "x", "url": "...", "timestamp": "..."}]
+    # Fotos y firma no se cargan por defecto: sólo el detalle las pide (undefer)
+    photos = deferred(Column(JSONB), raiseload=True)  # [{"question_id": "x", "url": "...", "timestamp": "..."}]
 
     # Firma digital
-    signature_data = Column(Text)  # Base64 PNG de la firma
+    signature_data = deferred(Column(Text), raiseload=True)  # Base64 PNG de la firma
     signed_by_name = Column(String(100), nullable=False)  # Nombre escrito del firmante
     signed_at = Column(DateTime, nullable=False)
 
@@ -115,7 +154,7 @@ class SelfEvaluation(Base):
     # Timestamps
     started_at = Column(DateTime)  # Cuando inició la evaluación
     completed_at = Column(DateTime)  # Cuando la completó
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
 
     # Relaciones
     template = relationship("EvaluationTemplate", back_populates="evaluations")
@@ -134,18 +173,15 @@ class SelfEvaluation(Base):
         """
         area_scores = {}
         total_score = 0.0
+        answers = self.answers
 
-        for area in template.areas.get("areas", []):
-            area_id = area["id"]
-            area_weight = area.get("weight", 1.0)
+        for area_id, area_weight, questions in template.compiled:
             area_score = 0.0
             applicable_weight = 0.0
 
-            for question in area.get("questions", []):
-                q_id = question["id"]
-                q_weight = question.get("weight", 1.0)
-                answer = self.answers.get(q_id, {})
-                value = answer.get("value")
+            for q_id, q_weight in questions:
+                answer = answers.get(q_id)
+                value = answer.get("value") if answer else None
 
                 # Saltar N/A
                 if value == "na":
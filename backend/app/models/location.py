@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Time
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Time, Index
 from sqlalchemy.orm import relationship
-from datetime import datetime, time
+from datetime import time
 
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class Location(Base):
@@ -13,6 +13,11 @@ class Location(Base):
     donde se debe aplicar el producto de Biorem.
     """
     __tablename__ = "locations"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Filtro de generate_daily_reminders (activa, con producto, última aplicación)
+        Index("ix_locations_reminder_due", "active", "product_id", "last_compliance_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -44,8 +49,8 @@ class Location(Base):
     last_compliance_by = Column(Integer, ForeignKey("contacts.id"), nullable=True)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     active = Column(Boolean, default=True, index=True)
 
     # Relaciones
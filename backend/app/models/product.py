@@ -1,8 +1,7 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class Product(Base):
@@ -13,6 +12,7 @@ class Product(Base):
     las fotos de evidencia con Claude Vision.
     """
     __tablename__ = "products"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -38,8 +38,8 @@ class Product(Base):
     category = Column(String(100))  # Ej: "Drenajes", "Trampas de grasa", etc.
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
     active = Column(Boolean, default=True, index=True)
 
     # Relaciones
@@ -1,11 +1,10 @@
 """Modelo para órdenes de productos."""
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index, text, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy.orm import relationship, deferred
 import enum
 
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class OrderStatus(str, enum.Enum):
@@ -30,6 +29,11 @@ class ProductOrder(Base):
     4. Si aprobada: processing → shipped → delivered
     """
     __tablename__ = "product_orders"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Pedidos por ubicación (list_orders: location_id = X ORDER BY created_at DESC)
+        Index("ix_product_orders_location_created", "location_id", text("created_at DESC")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -52,7 +56,8 @@ class ProductOrder(Base):
     )
 
     # Firma digital
-    signature_data = Column(Text, nullable=True)  # Base64 PNG
+    # No se carga por defecto: sólo /{order_id}/signature la pide (undefer)
+    signature_data = deferred(Column(Text, nullable=True), raiseload=True)  # Base64 PNG
     signed_by_name = Column(String(100), nullable=False)
     signed_at = Column(DateTime, nullable=False)
     signature_latitude = Column(Float, nullable=True)
@@ -66,8 +71,8 @@ class ProductOrder(Base):
 
     # Metadata
     telegram_user_id = Column(String(50), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
 
     # Relaciones ORM
     location = relationship("Location", backref="orders", foreign_keys=[location_id])
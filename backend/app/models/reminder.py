@@ -1,14 +1,15 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 
-from app.database import Base
+from app.database import Base, utcnow_sql
 
 
 class ReminderStatus(str, enum.Enum):
     """Estados posibles de un recordatorio."""
     PENDING = "pending"  # Programado, aún no enviado
+    SENDING = "sending"  # Reclamado por el scheduler, envío en curso
     SENT = "sent"  # Enviado, esperando respuesta
     COMPLETED = "completed"  # Completado exitosamente
     FAILED = "failed"  # Falló el envío
@@ -25,6 +26,21 @@ class ScheduledReminder(Base):
     para que realice la aplicación del producto en una ubicación.
     """
     __tablename__ = "scheduled_reminders"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Índices parciales para las consultas periódicas del scheduler
+        # (send_pending_reminders y check_escalations). El enum se guarda por nombre.
+        Index(
+            "ix_scheduled_reminders_pending_due", "scheduled_for",
+            postgresql_where=text("status = 'PENDING'")
+        ),
+        Index(
+            "ix_scheduled_reminders_sent_due", "sent_at",
+            postgresql_where=text("status = 'SENT'")
+        ),
+        # Recordatorios por ubicación (list_reminders: location_id = X ORDER BY scheduled_for DESC)
+        Index("ix_scheduled_reminders_location_scheduled", "location_id", text("scheduled_for DESC")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -60,8 +76,8 @@ class ScheduledReminder(Base):
     failure_reason = Column(String(255))  # Razón de fallo si aplica
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow_sql())
+    updated_at = Column(DateTime, server_default=utcnow_sql(), onupdate=utcnow_sql())
 
     # Relaciones
     location = relationship("Location", back_populates="reminders")
@@ -0,0 +1,37 @@
+"""Utilidades compartidas por los schemas de respuesta."""
+from typing import Any
+
+
+class TrustedORM:
+    """
+    Mixin para schemas de respuesta que se arman desde filas del ORM.
+
+    `from_orm_trusted` usa `model_construct`, que no valida: las filas vienen
+    de la base de datos con los tipos de sus columnas, y FastAPI vuelve a
+    validar la respuesta contra `response_model` antes de serializarla.
+    Sólo para listados de respuesta; nunca para schemas de entrada.
+    """
+
+    @classmethod
+    def from_orm_trusted(cls, obj: Any):
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
+
+
+class Paginated:
+    """
+    Mixin para los `*List` paginados (items, total, page, page_size, pages).
+
+    `build` calcula `pages` con división entera y arma el schema con
+    `model_construct`: los items ya son schemas construidos y FastAPI valida
+    la respuesta contra `response_model`.
+    """
+
+    @classmethod
+    def build(cls, items: list, total: int, page: int, page_size: int):
+        return cls.model_construct(
+            items=items,
+            total=total,
+            page=page,
+            page_size=page_size,
+            pages=max(1, -(-total // page_size))
+        )
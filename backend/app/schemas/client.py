@@ -4,6 +4,7 @@ from typing import Optional
 from datetime import datetime
 
 from app.models.client import BusinessType
+from app.schemas.base import Paginated, TrustedORM
 
 
 class ClientBase(BaseModel):
@@ -50,7 +51,7 @@ class ClientUpdate(BaseModel):
     active: Optional[bool] = None
 
 
-class ClientResponse(ClientBase):
+class ClientResponse(TrustedORM, ClientBase):
     """Schema de respuesta para Cliente."""
     model_config = ConfigDict(from_attributes=True)
 
@@ -60,7 +61,7 @@ class ClientResponse(ClientBase):
     updated_at: datetime
 
 
-class ClientList(BaseModel):
+class ClientList(Paginated, BaseModel):
     """Schema para lista de clientes con paginación."""
     items: list[ClientResponse]
     total: int
@@ -1,9 +1,10 @@
 """Schemas Pydantic para Compliance y Recordatorios."""
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Any
+from typing import Optional, Any, Literal
 from datetime import datetime
 
 from app.models.reminder import ReminderStatus
+from app.schemas.base import Paginated, TrustedORM
 
 
 # ==================== RECORDATORIOS ====================
@@ -21,7 +22,7 @@ class ReminderCreate(ReminderBase):
     pass
 
 
-class ReminderResponse(BaseModel):
+class ReminderResponse(TrustedORM, BaseModel):
     """Schema de respuesta para Recordatorio."""
     model_config = ConfigDict(from_attributes=True)
 
@@ -40,7 +41,7 @@ class ReminderResponse(BaseModel):
     created_at: datetime
 
 
-class ReminderList(BaseModel):
+class ReminderList(Paginated, BaseModel):
     """Schema para lista de recordatorios."""
     items: list[ReminderResponse]
     total: int
@@ -75,7 +76,7 @@ class AIValidationResult(BaseModel):
     summary: str
 
 
-class ComplianceResponse(BaseModel):
+class ComplianceResponse(TrustedORM, BaseModel):
     """Schema de respuesta para Compliance."""
     model_config = ConfigDict(from_attributes=True)
 
@@ -123,7 +124,7 @@ class ComplianceWithDetails(ComplianceResponse):
     ai_processing_time_ms: Optional[int]
 
 
-class ComplianceList(BaseModel):
+class ComplianceList(Paginated, BaseModel):
     """Schema para lista de compliance."""
     items: list[ComplianceResponse]
     total: int
@@ -152,6 +153,10 @@ class DashboardStats(BaseModel):
     escalated_count: int
 
 
+# Semáforo de compliance de una ubicación según días desde el último reporte
+ComplianceStatusCode = Literal["ok", "pending", "overdue", "critical"]
+
+
 class LocationComplianceStatus(BaseModel):
     """Estado de compliance por ubicación."""
     location_id: int
@@ -160,7 +165,7 @@ class LocationComplianceStatus(BaseModel):
     last_compliance_at: Optional[datetime]
     days_since_compliance: Optional[int]
     next_reminder_at: Optional[datetime]
-    status: str  # "ok", "pending", "overdue", "critical"
+    status: ComplianceStatusCode
 
 
 # ==================== VALIDATION STATS ====================
@@ -4,6 +4,7 @@ from typing import Optional
 from datetime import datetime
 
 from app.models.contact import ContactRole
+from app.schemas.base import Paginated, TrustedORM
 
 
 class ContactBase(BaseModel):
@@ -34,7 +35,7 @@ class ContactUpdate(BaseModel):
     active: Optional[bool] = None
 
 
-class ContactResponse(ContactBase):
+class ContactResponse(TrustedORM, ContactBase):
     """Schema de respuesta para Contacto."""
     model_config = ConfigDict(from_attributes=True)
 
@@ -60,7 +61,7 @@ class ContactWithInviteCode(ContactResponse):
     invite_code: str
 
 
-class ContactList(BaseModel):
+class ContactList(Paginated, BaseModel):
     """Schema para lista de contactos con paginación."""
     items: list[ContactResponse]
     total: int
@@ -3,6 +3,8 @@ from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
 from datetime import datetime, time
 
+from app.schemas.base import Paginated, TrustedORM
+
 
 class LocationBase(BaseModel):
     """Base schema para Ubicación."""
@@ -42,7 +44,7 @@ class LocationUpdate(BaseModel):
     active: Optional[bool] = None
 
 
-class LocationResponse(LocationBase):
+class LocationResponse(TrustedORM, LocationBase):
     """Schema de respuesta para Ubicación."""
     model_config = ConfigDict(from_attributes=True)
 
@@ -54,7 +56,7 @@ class LocationResponse(LocationBase):
     updated_at: datetime
 
 
-class LocationList(BaseModel):
+class LocationList(Paginated, BaseModel):
     """Schema para lista de ubicaciones con paginación."""
     items: list[LocationResponse]
     total: int
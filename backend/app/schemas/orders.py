@@ -4,6 +4,7 @@ from typing import Optional, List, Any
 from datetime import datetime
 
 from app.models.product_order import OrderStatus
+from app.schemas.base import Paginated
 
 
 # ==================== ORDER ITEMS ====================
@@ -93,7 +94,7 @@ class OrderWithDetails(OrderResponse):
 
 # ==================== ORDER LIST ====================
 
-class OrderList(BaseModel):
+class OrderList(Paginated, BaseModel):
     """Schema para lista paginada de pedidos."""
     items: List[OrderWithDetails]
     total: int
@@ -3,6 +3,8 @@ from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
 from datetime import datetime
 
+from app.schemas.base import TrustedORM
+
 
 class ProductBase(BaseModel):
     """Base schema para Producto."""
@@ -38,7 +40,7 @@ class ProductUpdate(BaseModel):
     active: Optional[bool] = None
 
 
-class ProductResponse(ProductBase):
+class ProductResponse(TrustedORM, ProductBase):
     """Schema de respuesta para Producto."""
     model_config = ConfigDict(from_attributes=True)
 
@@ -4,6 +4,8 @@ from typing import Optional
 from datetime import datetime
 from enum import Enum
 
+from app.schemas.compliance import ComplianceStatusCode
+
 
 class PeriodType(str, Enum):
     """Tipos de agrupación por período."""
@@ -55,7 +57,7 @@ class LocationComplianceReport(BaseModel):
     last_compliance_at: Optional[datetime]
     days_since_compliance: Optional[int]
     frequency_days: int
-    status: str  # "ok", "pending", "overdue", "critical"
+    status: ComplianceStatusCode
 
 
 class ComplianceTrend(BaseModel):
@@ -0,0 +1,102 @@
+"""
+Caché en memoria de ubicaciones para el scheduler de recordatorios.
+
+Los recordatorios y escalamientos sólo necesitan unos pocos datos de la
+ubicación y su producto (nombre, instrucciones, dosis), que cambian muy poco.
+En lugar de consultarlos en cada envío se guarda una copia con TTL, indexada
+por ID, que se invalida desde los endpoints que editan ubicaciones o productos.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.config import settings
+from app.models.location import Location
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LocationSnapshot:
+    """Datos de una ubicación (y su producto) necesarios para los mensajes."""
+    id: int
+    client_id: int
+    name: str
+    product_name: Optional[str] = None
+    application_instructions: Optional[str] = None
+    dosage: Optional[str] = None
+
+    @classmethod
+    def from_location(cls, location: Location) -> "LocationSnapshot":
+        product = location.product
+        return cls(
+            id=location.id,
+            client_id=location.client_id,
+            name=location.name,
+            product_name=product.name if product else None,
+            application_instructions=product.application_instructions if product else None,
+            dosage=product.dosage if product else None,
+        )
+
+
+# location_id -> (expira_en, snapshot)
+_cache: dict[int, tuple[float, LocationSnapshot]] = {}
+
+
+def _store(snapshot: LocationSnapshot):
+    _cache[snapshot.id] = (time.monotonic() + settings.LOCATION_CACHE_TTL_SECONDS, snapshot)
+
+
+async def get_location_snapshot(location_id: int, db: AsyncSession) -> Optional[LocationSnapshot]:
+    """Obtiene la ubicación desde la caché o, si expiró, desde la base de datos."""
+    entry = _cache.get(location_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+
+    result = await db.execute(
+        select(Location)
+        .options(joinedload(Location.product))
+        .where(Location.id == location_id)
+    )
+    location = result.scalar_one_or_none()
+
+    if not location:
+        _cache.pop(location_id, None)
+        return None
+
+    snapshot = LocationSnapshot.from_location(location)
+    _store(snapshot)
+    return snapshot
+
+
+async def preload_locations(db: AsyncSession) -> int:
+    """Carga todas las ubicaciones activas en la caché de una sola vez."""
+    result = await db.execute(
+        select(Location)
+        .options(joinedload(Location.product))
+        .where(Location.active == True)
+    )
+    locations = result.scalars().all()
+
+    for location in locations:
+        _store(LocationSnapshot.from_location(location))
+
+    logger.info(f"Preloaded {len(locations)} locations into cache")
+    return len(locations)
+
+
+def invalidate_location(location_id: Optional[int] = None):
+    """
+    Invalida la caché de ubicaciones.
+
+    Sin argumentos vacía la caché completa (p. ej. al editar un producto,
+    que puede estar asignado a muchas ubicaciones).
+    """
+    if location_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(location_id, None)
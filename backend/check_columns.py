@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from sqlalchemy import text
 from app.database import async_engine
+from app.main import PHOTO_GUARD_COLUMNS
 
 
 async def check_columns():
@@ -19,23 +20,10 @@ async def check_columns():
     print("DIAGNÓSTICO DE COLUMNAS - Photo Guard")
     print("=" * 60)
 
+    # Mismas columnas que asegura el fixup de arranque, para que no diverjan
     columns_to_check = {
-        "contacts": [
-            "last_known_latitude",
-            "last_known_longitude",
-            "last_location_at",
-            "last_location_accuracy"
-        ],
-        "compliance_records": [
-            "expected_latitude",
-            "expected_longitude",
-            "authenticity_score",
-            "location_verified",
-            "time_verified",
-            "distance_from_expected",
-            "time_diff_minutes",
-            "ai_appears_screenshot"
-        ]
+        table: [name for name, _ in columns]
+        for table, columns in PHOTO_GUARD_COLUMNS.items()
     }
 
     async with async_engine.connect() as conn:
@@ -19,6 +19,7 @@ export type ContactRole =
 
 export type ReminderStatus =
   | "pending"
+  | "sending"
   | "sent"
   | "completed"
   | "failed"